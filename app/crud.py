@@ -1,26 +1,39 @@
+from collections.abc import AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.models import User
 
+# Statements built once at import so hot paths skip construction and cache-key
+# generation; per-call values are supplied as bind parameters.
+_GET_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_GET_USERS = select(User)
+_GET_USERS_WITH_MESSAGES = select(User).options(selectinload(User.messages))  # 2 queries total, not N+1
+
 async def create_user(session: AsyncSession, name: str, title: str | None = None) -> User:
-    user = User(name=name, title=title)
-    session.add(user)
-    await session.commit()
-    await session.refresh(user)  # load auto-generated fields
+    # INSERT ... RETURNING: one round trip instead of add/flush + refresh
+    stmt = insert(User).values(name=name, title=title).returning(User)
+    result = await session.execute(stmt)
+    user = result.scalar_one()
+    await session.commit()  # expire_on_commit=False keeps the returned row loaded
     return user
 
 async def get_user_by_id(session: AsyncSession, user_id: UUID) -> User | None:
-    stmt = select(User).where(User.id == user_id)
-    result = await session.execute(stmt)
+    result = await session.execute(_GET_USER_BY_ID, {"user_id": user_id})
     return result.scalar_one_or_none()
 
-async def get_users(session: AsyncSession) -> list[User]:
-    stmt = select(User)
-    result = await session.execute(stmt)
+async def get_users(session: AsyncSession, with_messages: bool = False) -> list[User]:
+    result = await session.execute(_GET_USERS_WITH_MESSAGES if with_messages else _GET_USERS)
     return result.scalars().all()
 
+async def stream_users(session: AsyncSession, batch_size: int = 1000) -> AsyncIterator[list[User]]:
+    # Server-side cursor; only one partition of ORM objects is alive at a time
+    result = await session.stream_scalars(_GET_USERS, execution_options={"yield_per": batch_size})
+    async for partition in result.partitions():
+        yield partition
+
 async def get_user(session: AsyncSession, user_id: UUID) -> User | None:
     return await get_user_by_id(session, user_id)
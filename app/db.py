@@ -1,11 +1,14 @@
 import os
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from app.models import Base
 
+logger = logging.getLogger(__name__)
+
 DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_NAME = os.getenv('POSTGRES_DB', 'postgres')
 DB_USER = os.getenv('POSTGRES_USER', 'postgres')
@@ -13,17 +16,40 @@ DB_PASSWORD = os.getenv('POSTGRES_PASSWORD', 'mypassword')
 
 DATABASE_URL = os.getenv("DATABASE_URL", f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:5432/{DB_NAME}")
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# pgbouncer in transaction mode can't keep asyncpg's prepared statements around
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+# Module-level engine, shared by every request and disposed in the app lifespan.
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=DB_ECHO,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=DB_POOL_RECYCLE,
+    connect_args=(
+        {"server_settings": {"jit": "off"}, "statement_cache_size": 0}
+        if DB_PGBOUNCER
+        else {}
+    ),
+)
 
-AsyncSessionLocal = sessionmaker(
-    autocommit=False,
+# expire_on_commit=False keeps ORM attributes loaded after commit, so callers
+# don't pay for another SELECT when they read the object back.
+AsyncSessionLocal = async_sessionmaker(
+    engine,
+    expire_on_commit=False,
     autoflush=False,
-    bind=engine,
-    class_=AsyncSession
 )
 
 async def init_db():
-    print("Initializing database...")
+    logger.info("Initializing database...")
 
     # IMPORTANT: import models so they are registered with Base.metadata
     # from app import models  # uncomment when you have models
@@ -32,13 +58,34 @@ async def init_db():
         await conn.run_sync(Base.metadata.create_all)
         await conn.commit()
 
+    await warm_pool()
+
+async def warm_pool():
+    # The pool opens connections lazily, so the first burst of requests after
+    # boot would each pay connect + auth. Open pool_size connections up front
+    # and hand them back to the pool.
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(DB_POOL_SIZE)), return_exceptions=True
+    )
+    conns = [r for r in results if not isinstance(r, BaseException)]
+    # Return whatever did open before surfacing a failure, so nothing leaks
+    await asyncio.gather(*(conn.close() for conn in conns))
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        raise errors[0]
+    logger.info("Warmed database pool with %d connections", len(conns))
+
 async def close_db_connections():
     # Dispose the engine and close all connections
     await engine.dispose()
 
+@asynccontextmanager
+async def db_session():
+    # For direct use inside handlers / background tasks: `async with db_session() as s:`
+    async with AsyncSessionLocal() as session:
+        yield session
+
 async def get_db():
-    session: AsyncSession = AsyncSessionLocal()
-    try:
+    # FastAPI dependency: `db: AsyncSession = Depends(get_db)`
+    async with AsyncSessionLocal() as session:
         yield session
-    finally:
-        await session.close()
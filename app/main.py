@@ -1,31 +1,71 @@
+import hashlib
 import logging
+import queue
+import time
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from uuid import UUID
 
-from fastapi import FastAPI, HTTPException, Request, Depends
+import orjson
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Request, Response, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import init_db, close_db_connections, get_db
+from app.db import init_db, close_db_connections, db_session, get_db
 from app.vector_db import init_weaviate
-from app.slack import handler, client
+from app.slack import (
+    handler, handle_event, is_duplicate_event, signature_verifier,
+    open_slack_session, close_slack_session, get_channels, get_users, get_user_loader,
+)
 from app import crud
-from app.schemas import UserCreate, UserRead
+from app.schemas import UserCreate, UserRead, USER_LIST_ADAPTER
+
+
+logger = logging.getLogger(__name__)
+
+# Handlers only enqueue records; a background thread does the actual stream
+# I/O so logging never blocks the event loop.
+_log_queue: queue.Queue = queue.Queue(-1)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(), respect_handler_level=True)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
+    _log_listener.start()
     await init_db()
     init_weaviate()
+    await open_slack_session()
     
     yield  # Application runs here
 
-    print("Closing database connections...")
+    await close_slack_session()
+    logger.info("Closing database connections...")
     await close_db_connections()   # Shutdown
+    _log_listener.stop()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# HTTP cache TTLs (seconds) for read-only list endpoints
+CACHE_TTL_SHORT = 30
+CACHE_TTL_NORMAL = 300
+CACHE_TTL_LONG = 600
 
-app = FastAPI(lifespan=lifespan)
+
+def cached_json(request: Request, payload, ttl: int) -> Response:
+    """Serialize payload with a weak ETag + Cache-Control; 304 if the client already has it."""
+    # Duplicated in mcp/slack_mcp/slack_data_mcp_server.py: the two services are
+    # built from separate Docker contexts and can't import each other. Keep the
+    # copies identical.
+    body = orjson.dumps(payload)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={ttl}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @app.get("/")
@@ -33,24 +73,65 @@ async def read_root():
     return {"message": "Hello, FastAPI with PostgreSQL!"}
 
 
+# Probes hit /health every few seconds per pod; reuse a recent successful
+# check instead of taking a pool connection each time. Failures are never
+# cached, so a recovered database is reported healthy on the next probe.
+HEALTH_CACHE_TTL = 5.0
+_health_cache = {"ts": 0.0, "ok": False}
+
+
 @app.get("/health")
 async def health_check():
+    if _health_cache["ok"] and time.monotonic() - _health_cache["ts"] < HEALTH_CACHE_TTL:
+        return {"status": "healthy", "database": "connected"}
+    _health_cache["ok"] = False
     try:
-        async with get_db() as session:
+        async with db_session() as session:
             await session.execute(text("SELECT 1"))
+        _health_cache.update(ts=time.monotonic(), ok=True)
         return {"status": "healthy", "database": "connected"}
     except OperationalError as e:
-        logging.error(f"Database connection failed: {e}")
+        logger.error("Database connection failed: %s", e)
         raise HTTPException(status_code=500, detail="Server error")
     except Exception as e:
-        logging.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         raise HTTPException(status_code=500, detail="Server error")
 
 
 @app.post("/slack/events")
-async def slack_events(request: Request):
-    print(f"Received Slack event: {request}")
-    return await handler.handle(request)
+async def slack_events(request: Request, background_tasks: BackgroundTasks):
+    body = await request.body()  # cached on the Request for the background handler
+    if not signature_verifier.is_valid_request(body, dict(request.headers)):
+        return Response(status_code=401)
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        payload = {}
+    # The URL verification handshake must echo the challenge in the response itself
+    if payload.get("type") == "url_verification":
+        return await handler.handle(request)
+
+    # Slack retries anything not acked within 3s. Only retries of an event we
+    # have already handed to the handler are dropped; anything else (e.g. the
+    # original was lost to a restart or failed) is processed normally.
+    event_id = payload.get("event_id")
+    if request.headers.get("x-slack-retry-num") and is_duplicate_event(event_id):
+        return Response(status_code=200)
+
+    background_tasks.add_task(handle_event, request, event_id)
+    return Response(status_code=200)
+
+@app.get("/slack/channels")
+async def list_slack_channels(request: Request):
+    return cached_json(request, {"channels": await get_channels()}, CACHE_TTL_LONG)
+
+@app.get("/slack/users")
+async def list_slack_users(request: Request):
+    return cached_json(request, {"users": await get_users()}, CACHE_TTL_LONG)
+
+@app.get("/slack/users/{user_id}")
+async def read_slack_user(user_id: str):
+    return {"user": await get_user_loader().load(user_id)}
 
 # CRUD ENDPOINTS ###
 
@@ -62,12 +143,19 @@ async def create_user(
     user = await crud.create_user(db, user_in.name, user_in.title)
     return user
 
-@app.get("/users", response_model=list[UserRead])
+# response_model=None: the payload is built by USER_LIST_ADAPTER, so skip FastAPI's
+# second validation pass; the schema is still published via `responses`.
+@app.get("/users", response_model=None, responses={200: {"model": list[UserRead]}})
 async def list_users(
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    users = await crud.get_users(db)
-    return users
+    payload = []
+    async for users in crud.stream_users(db):
+        payload.extend(USER_LIST_ADAPTER.dump_python(
+            USER_LIST_ADAPTER.validate_python(users, from_attributes=True), mode="json"
+        ))
+    return cached_json(request, payload, CACHE_TTL_SHORT)
 
 @app.get("/users/{user_id}", response_model=UserRead)
 async def read_user(
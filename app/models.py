@@ -1,11 +1,14 @@
 import uuid
 
-from sqlalchemy import Column, Enum, String, Text, DateTime, Date, Integer, PrimaryKeyConstraint, UniqueConstraint, ForeignKey
+from sqlalchemy import Column, Enum, String, Text, DateTime, Date, Integer, Index, PrimaryKeyConstraint, UniqueConstraint, ForeignKey, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
 
+# One-to-many collections use lazy="raise": implicit lazy loads would do sync
+# I/O inside an AsyncSession, so callers must eager-load them (selectinload).
+
 class User(Base):
     __tablename__ = "users"
 
@@ -16,7 +19,7 @@ class User(Base):
     workspace_id = Column(UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False)
 
     workspace = relationship("Workspace", back_populates="users")
-    messages = relationship("Message", back_populates="user")
+    messages = relationship("Message", back_populates="user", lazy="raise")
 
 class Workspace(Base):
     __tablename__ = "workspaces"
@@ -24,8 +27,9 @@ class Workspace(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, unique=True, nullable=False)
 
-    channels = relationship("Channel", back_populates="workspace")
-    messages = relationship("Message", back_populates="workspace")
+    users = relationship("User", back_populates="workspace", lazy="raise")
+    channels = relationship("Channel", back_populates="workspace", lazy="raise")
+    messages = relationship("Message", back_populates="workspace", lazy="raise")
 
 class Channel(Base):
     __tablename__ = "channels"
@@ -36,10 +40,17 @@ class Channel(Base):
     workspace_id = Column(UUID(as_uuid=True), ForeignKey("workspaces.id"), nullable=False)
 
     workspace = relationship("Workspace", back_populates="channels")
-    messages = relationship("Message", back_populates="channel")
+    messages = relationship("Message", back_populates="channel", lazy="raise")
 
 class Message(Base):
     __tablename__ = "messages"
+    # Postgres does not index FKs automatically; cover the per-channel and
+    # per-user "recent messages" lookups and thread reply fetches.
+    __table_args__ = (
+        Index("ix_messages_channel_ts", "channel_id", "message_ts"),
+        Index("ix_messages_user_ts", "user_id", "message_ts"),
+        Index("ix_messages_thread_ts", "thread_ts", postgresql_where=text("thread_ts IS NOT NULL")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     ts = Column(String, nullable=False)  # raw Slack ts
@@ -56,7 +67,10 @@ class Message(Base):
 
 class TopicCounts(Base):
     __tablename__ = "topic_counts"
-    __table_args__ = (PrimaryKeyConstraint("date", "topic", "channel_id", name="pk_topic_counts"),)
+    __table_args__ = (
+        PrimaryKeyConstraint("date", "topic", "channel_id", name="pk_topic_counts"),
+        Index("ix_topic_counts_channel_date", "channel_id", "date"),
+    )
 
     date = Column(Date, nullable=False)
     topic = Column(Enum("PCB", "impedance", "power", "firmware", "mechanical", name="topic_enum"), nullable=False)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from uuid import UUID
 
 class UserBase(BaseModel):
@@ -13,3 +13,6 @@ class UserRead(UserBase):
 
     class Config:
         from_attributes = True
+
+# Built once at import; reused to (de)serialize user lists without per-request schema setup
+USER_LIST_ADAPTER = TypeAdapter(list[UserRead])
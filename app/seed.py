@@ -1,16 +1,24 @@
 import asyncio
 
+from sqlalchemy import insert
+
 from app.db import AsyncSessionLocal, engine
-from app.models import Base, User
+from app.models import Base, User, Workspace
 
 async def seed():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
     async with AsyncSessionLocal() as session:
-        session.add_all([
-            User(name="Test User 1", title="Engineer"),
-            User(name="Test User 2", title="PCB Designer"),
+        result = await session.execute(
+            insert(Workspace).values(name="Test Workspace").returning(Workspace.id)
+        )
+        workspace_id = result.scalar_one()
+
+        # Single executemany instead of one ORM INSERT per row
+        await session.execute(insert(User), [
+            {"name": "Test User 1", "title": "Engineer", "slack_user_id": "U00000001", "workspace_id": workspace_id},
+            {"name": "Test User 2", "title": "PCB Designer", "slack_user_id": "U00000002", "workspace_id": workspace_id},
         ])
         await session.commit()
 
@@ -1,9 +1,16 @@
 import os 
+import asyncio
 import logging
+import httpx
+from aiodataloader import DataLoader
+from aiolimiter import AsyncLimiter
+from cachetools import LRUCache, TTLCache
 from dotenv import load_dotenv
 
 from slack_bolt.adapter.fastapi import SlackRequestHandler
 from slack_bolt import App
+from slack_sdk.errors import SlackApiError
+from slack_sdk.signature import SignatureVerifier
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +19,195 @@ load_dotenv() # take environment variables from .env.
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 SLACK_SIGNING_SECRET = os.environ.get("SLACK_SIGNING_SECRET")
 
-client = WebClient(token=SLACK_BOT_TOKEN)
+SLACK_API_URL = "https://slack.com/api"
+
+
+class SlackWebClient:
+    """Minimal async Slack Web API client on a shared HTTP/2 httpx pool.
+
+    Concurrent calls multiplex over one keep-alive connection to slack.com
+    instead of paying a TCP+TLS handshake each. Only the read methods this
+    app uses are exposed; Bolt keeps its own client for event handling.
+    """
+
+    def __init__(self, token: str | None):
+        self.token = token
+        self._http: httpx.AsyncClient | None = None
+
+    async def open(self):
+        self._http = httpx.AsyncClient(
+            base_url=SLACK_API_URL,
+            headers={"Authorization": f"Bearer {self.token}"},
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(10.0),
+        )
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def api_call(self, method: str, **params) -> dict:
+        if self._http is None:
+            await self.open()
+        resp = await self._http.post(f"/{method}", data=params)
+        resp.raise_for_status()
+        data = resp.json()
+        if not data.get("ok"):
+            raise SlackApiError(f"Slack API error on {method}: {data.get('error')}", data)
+        return data
+
+    async def conversations_list(self, **params) -> dict:
+        return await self.api_call("conversations.list", **params)
+
+    async def users_list(self, **params) -> dict:
+        return await self.api_call("users.list", **params)
+
+    async def users_info(self, **params) -> dict:
+        return await self.api_call("users.info", **params)
+
+
+class RateLimitedSlackClient:
+    """Shapes outbound calls to each method's Slack tier limit.
+
+    Concurrent handlers queue locally on a per-method limiter rather than
+    bursting into 429 + Retry-After. If Slack still answers 429, the last
+    successful response for the same call is served instead of failing.
+    """
+
+    # Requests per minute, from Slack's published method tiers
+    METHOD_RATES = {
+        "conversations_list": 20,   # tier 2
+        "users_list": 20,           # tier 2
+        "users_info": 100,          # tier 4
+    }
+    DEFAULT_RATE = 20
+    # One fallback entry per distinct call (users_info is keyed per user id)
+    LAST_OK_MAXSIZE = 4096
+
+    def __init__(self, client: SlackWebClient):
+        self._c = client
+        self._limiters: dict[str, AsyncLimiter] = {}
+        self._last_ok: LRUCache = LRUCache(maxsize=self.LAST_OK_MAXSIZE)
+
+    async def open(self):
+        await self._c.open()
+
+    async def close(self):
+        await self._c.close()
+
+    def _limiter(self, method: str) -> AsyncLimiter:
+        limiter = self._limiters.get(method)
+        if limiter is None:
+            rate = self.METHOD_RATES.get(method, self.DEFAULT_RATE)
+            limiter = self._limiters[method] = AsyncLimiter(rate, time_period=60)
+        return limiter
+
+    async def call(self, method: str, **kwargs) -> dict:
+        key = (method, tuple(sorted(kwargs.items())))
+        async with self._limiter(method):
+            try:
+                data = await getattr(self._c, method)(**kwargs)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 429 and key in self._last_ok:
+                    logger.warning("Rate limited on %s; serving last good response", method)
+                    return self._last_ok[key]
+                raise
+        self._last_ok[key] = data
+        return data
+
+
+client = RateLimitedSlackClient(SlackWebClient(token=SLACK_BOT_TOKEN))
+
+async def open_slack_session():
+    await client.open()
+
+async def close_slack_session():
+    await client.close()
 
 bolt_app = App(token=SLACK_BOT_TOKEN, signing_secret=SLACK_SIGNING_SECRET)
 handler = SlackRequestHandler(bolt_app)
+signature_verifier = SignatureVerifier(signing_secret=SLACK_SIGNING_SECRET or "")
+
+# Event ids handed to Bolt, kept for Slack's retry window (~1h of backoff).
+# Retries are only dropped for ids in here; failed handling removes the id so
+# Slack's next retry is processed.
+processed_event_ids = TTLCache(maxsize=10_000, ttl=3600)
+
+
+def is_duplicate_event(event_id) -> bool:
+    return bool(event_id) and event_id in processed_event_ids
+
+
+async def handle_event(request, event_id=None):
+    """Run the Bolt handler for a verified event, tracking its event_id."""
+    if event_id:
+        processed_event_ids[event_id] = True
+    try:
+        response = await handler.handle(request)
+    except Exception:
+        processed_event_ids.pop(event_id, None)
+        logger.exception("Slack event %s failed", event_id)
+        return
+    if response.status_code >= 400:
+        processed_event_ids.pop(event_id, None)
+        logger.warning("Slack event %s handled with status %s", event_id, response.status_code)
+
+
+# SLACK WEB API READS (TTL-cached) ###
+
+# users.list is tier 2 (~20/min); rosters change on the order of minutes, so
+# serve repeated reads from memory. Cache the decoded lists, not SlackResponse.
+channels_cache = TTLCache(maxsize=64, ttl=600)
+users_cache = TTLCache(maxsize=1, ttl=600)
+user_info_cache = TTLCache(maxsize=4096, ttl=300)
+
+async def get_channels(types: str = "public_channel,private_channel") -> list[dict]:
+    channels = channels_cache.get(types)
+    if channels is None:
+        response = await client.call("conversations_list", types=types)
+        channels = channels_cache[types] = response.get("channels", [])
+    return channels
+
+async def get_users() -> list[dict]:
+    members = users_cache.get("members")
+    if members is None:
+        response = await client.call("users_list")
+        members = users_cache["members"] = response.get("members", [])
+    return members
+
+async def get_user_info(user_id: str) -> dict:
+    user = user_info_cache.get(user_id)
+    if user is None:
+        response = await client.call("users_info", user=user_id)
+        user = user_info_cache[user_id] = response.get("user", {})
+    return user
+
+async def _batch_load_users(user_ids: list[str]) -> list[dict | Exception]:
+    # Resolve a whole batch from the cached users.list; only ids missing from
+    # the roster (e.g. just-joined users) fall back to users.info, concurrently.
+    # A failed lookup is returned as that key's Exception, so DataLoader fails
+    # only the matching load() instead of the whole batch.
+    users_by_id = {u["id"]: u for u in await get_users()}
+    misses = [uid for uid in dict.fromkeys(user_ids) if uid not in users_by_id]
+    if misses:
+        infos = await asyncio.gather(*(get_user_info(uid) for uid in misses), return_exceptions=True)
+        users_by_id.update(zip(misses, infos))
+    return [users_by_id[uid] for uid in user_ids]
+
+_user_loader: DataLoader | None = None
+
+def get_user_loader() -> DataLoader:
+    """Coalesces concurrent single-user lookups within one event-loop tick.
+
+    Created lazily so it binds to the running loop; memoization is left to the
+    TTL caches above (cache=False) so stale profiles are not kept forever.
+    """
+    global _user_loader
+    if _user_loader is None:
+        _user_loader = DataLoader(batch_load_fn=_batch_load_users, cache=False)
+    return _user_loader
 
 
 # SLACK INTEGRATION EVENT SUBSCRIPTIONS ###
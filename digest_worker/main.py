@@ -1,19 +1,24 @@
 import os
-import requests
+import asyncio
+import httpx
 from datetime import date
 
 
 MCP_SLACK_URL = os.getenv("MCP_SLACK_URL", "http://localhost:3030")
 MCP_SEMANTIC_URL = os.getenv("MCP_SEMANTIC_URL", "http://localhost:6060")
+DIGEST_CONCURRENCY = int(os.getenv("DIGEST_CONCURRENCY", "20"))
+# Per-request timeout for MCP calls; semantic search embeds the query, so allow
+# well over httpx's 5s default
+DIGEST_HTTP_TIMEOUT_S = float(os.getenv("DIGEST_HTTP_TIMEOUT_S", "60"))
 
-def fetch_all_users():
+async def fetch_all_users(client):
     """Call Slack MCP server to get user list."""
-    resp = requests.get(f"{MCP_SLACK_URL}/tools/list_users")
+    resp = await client.get(f"{MCP_SLACK_URL}/tools/list_users")
     resp.raise_for_status()
     return resp.json()["users"]
 
 
-def fetch_relevant_messages(user_id):
+async def fetch_relevant_messages(client, user_id):
     """Call Semantic Search MCP server."""
     payload = {
         "user_id": user_id,
@@ -21,7 +26,7 @@ def fetch_relevant_messages(user_id):
         "timeframe_days": 1,
         "recency_weight": 0.5
     }
-    resp = requests.post(f"{MCP_SEMANTIC_URL}/tools/fetch_relevant_messages", json=payload)
+    resp = await client.post(f"{MCP_SEMANTIC_URL}/tools/fetch_relevant_messages", json=payload)
     resp.raise_for_status()
     return resp.json()["results"]
 
@@ -37,27 +42,43 @@ def format_digest(relevant_messages):
     return "\n".join(lines)
 
 
-def deliver_digest(user_id, digest_text):
+async def deliver_digest(client, user_id, digest_text):
     """Send digest via Slack MCP server."""
     payload = {"user_id": user_id, "text": digest_text}
-    resp = requests.post(f"{MCP_SLACK_URL}/send_message", json=payload)
+    resp = await client.post(f"{MCP_SLACK_URL}/send_message", json=payload)
     resp.raise_for_status()
 
 
-def main():
+async def main():
     print(f"[{date.today()}] Running daily digest job…")
 
-    users = fetch_all_users()
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    timeout = httpx.Timeout(DIGEST_HTTP_TIMEOUT_S)
+    # One pooled client for every MCP call in this run. The MCP servers are plain
+    # http, where httpx would never negotiate HTTP/2 anyway, so stick to HTTP/1.1.
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        users = await fetch_all_users(client)
+        sem = asyncio.Semaphore(DIGEST_CONCURRENCY)
 
-    for user in users:
-        uid = user["id"]
-        print(f"Generating digest for {uid}...")
-        messages = fetch_relevant_messages(uid)
-        digest = format_digest(messages)
-        deliver_digest(uid, digest)
+        async def one(user):
+            uid = user["id"]
+            async with sem:
+                print(f"Generating digest for {uid}...")
+                messages = await fetch_relevant_messages(client, uid)
+                digest = format_digest(messages)
+                await deliver_digest(client, uid, digest)
 
-    print("Daily digest job complete.")
+        # One user's failure must not cancel or hide the rest of the run
+        results = await asyncio.gather(*(one(user) for user in users), return_exceptions=True)
+
+    failed = 0
+    for user, result in zip(users, results):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"Digest for {user['id']} failed: {type(result).__name__}: {result}")
+
+    print(f"Daily digest job complete ({len(users) - failed}/{len(users)} delivered).")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,20 +1,66 @@
 import os
 import time
+import asyncio
 import logging
+import threading
 import uuid
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from dotenv import load_dotenv
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+import numpy as np
+from pybloom_live import ScalableBloomFilter
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from vector_db import init_weaviate
+from vector_db import get_collection
+from weaviate.classes.query import Filter, MetadataQuery, Sort
 from weaviate.exceptions import WeaviateBaseError
 
 
 WEAVIATE_CLASS_NAME = "Message"
 
+# Default recency half-life: the recency score halves every this many days
+RECENCY_HALF_LIFE_DAYS = 30.0
+
+# Retry policy for objects a batch upsert reports as failed
+BATCH_RETRY_SIZE = 100
+BATCH_RETRY_ROUNDS = 3
+
+# Bloom filter sizing for ids already stored in Weaviate; it starts small and
+# grows (4x per stage) with the collection
+KNOWN_IDS_INITIAL_CAPACITY = 100_000
+KNOWN_IDS_ERROR_RATE = 1e-4
+# Max ids per batched by-id lookup (Bloom filter confirms, stored counts)
+ID_LOOKUP_CHUNK = 1000
+
+# How often queued retrieval_count increments are written to Weaviate
+RETRIEVAL_FLUSH_INTERVAL_S = float(os.getenv("RETRIEVAL_FLUSH_INTERVAL_S", "10"))
+
+# Reciprocal Rank Fusion constant for merging vector + BM25 rankings
+RRF_K = 60
+
+# Same model Weaviate's text2vec-ollama module vectorizes stored messages with
+OLLAMA_API_ENDPOINT = os.getenv("OLLAMA_API_ENDPOINT", "http://ollama:11434")
+OLLAMA_EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+
+SEARCH_PROPERTIES = [
+    "message_id",
+    "workspace_id",
+    "channel_id",
+    "user_id",
+    "text",
+    "ts",
+    "topics",
+    "importance",
+    "retrieval_count",
+]
+
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s [%(levelname)s] semantic-mcp: %(message)s",
 )
 logger = logging.getLogger(__name__)
@@ -37,19 +83,35 @@ class MessageInput(BaseModel):
     text: str
     ts: float = Field(..., description="Unix timestamp (seconds)")
     topics: Optional[List[str]] = Field(default=None, description="Optional topic tags (e.g. ['pcb', 'firmware'])")
+    importance: float = Field(0.0, description="Optional importance signal in [0, 1].", ge=0.0, le=1.0)
+    weaviate_id: Optional[uuid.UUID] = Field(
+        default=None,
+        description=(
+            "Precomputed uuid5 of 'channel_id:ts' (NAMESPACE_URL). Derived server-side if omitted; "
+            "any UUID spelling is accepted and normalized to canonical form."
+        ),
+    )
 
 
 class EmbedAndUpsertRequest(BaseModel):
     messages: List[MessageInput]
+    skip_existing: bool = Field(
+        False,
+        description=(
+            "Skip messages whose id is already stored (e.g. history backfills). "
+            "Checked against a Bloom filter, so edits to stored messages are not applied."
+        ),
+    )
 
 
 class EmbedAndUpsertResponse(BaseModel):
     upserted_count: int
+    skipped_count: int = 0
 
 
 class SearchRequest(BaseModel):
     user_id: Optional[str] = Field(None, description="User for personalization (optional).")
-    # workspace_id: str
+    workspace_id: Optional[str] = Field(None, description="Restrict results to this workspace (optional).")
     query: Optional[str] = Field(
         None,
         description="Free-text query. If omitted, topics are used as concepts.",
@@ -72,7 +134,10 @@ class SearchRequest(BaseModel):
     )
     min_score: float = Field(
         0.0,
-        description="Minimum semantic score (certainty) required.",
+        description=(
+            "Minimum vector certainty required. When > 0, only hits that clear it in "
+            "the vector search are returned, even if they also match by keyword or recency."
+        ),
         ge=0.0,
         le=1.0,
     )
@@ -82,6 +147,24 @@ class SearchRequest(BaseModel):
         ge=0.0,
         le=1.0,
     )
+    recency_half_life_days: float = Field(
+        RECENCY_HALF_LIFE_DAYS,
+        description="Days after which a message's recency score halves.",
+        ge=1.0,
+        le=365.0,
+    )
+    frequency_weight: float = Field(
+        0.05,
+        description="Weight of how often a message has been retrieved before.",
+        ge=0.0,
+        le=1.0,
+    )
+    importance_weight: float = Field(
+        0.10,
+        description="Weight of the stored per-message importance signal.",
+        ge=0.0,
+        le=1.0,
+    )
 
 
 class SearchResultItem(BaseModel):
@@ -92,6 +175,8 @@ class SearchResultItem(BaseModel):
     text: str
     ts: float
     topics: Optional[List[str]] = None
+    retrieval_count: int = 0
+    importance: float = 0.0
     semantic_score: float
     recency_score: float
     final_score: float
@@ -105,12 +190,27 @@ class SearchResponse(BaseModel):
 # Helpers
 # ------------------------------------------------------------
 
-def _upsert_message(msg: MessageInput) -> None:
-    """Create or update a Weaviate object for this message."""
-    slack_key = f"{msg.channel_id}:{msg.ts}"  # "C67890:1711000000.001"
-    weaviate_id = str(uuid.uuid5(uuid.NAMESPACE_URL, slack_key))
+@lru_cache(maxsize=100_000)
+def _slack_key_to_uuid(channel_id: str, ts: float) -> str:
+    slack_key = f"{channel_id}:{ts}"  # "C67890:1711000000.001"
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, slack_key))
+
 
-    data: Dict[str, Any] = {
+def _message_uuid(msg: MessageInput) -> str:
+    """Deterministic Weaviate id for a Slack message, so re-ingesting it is idempotent."""
+    # str(UUID) is canonical lowercase-hyphenated, matching the ids Weaviate
+    # reports back (failed_objects, fetch_objects) and the Bloom filter keys.
+    if msg.weaviate_id is not None:
+        return str(msg.weaviate_id)
+    return _slack_key_to_uuid(msg.channel_id, msg.ts)
+
+
+def _message_properties(msg: MessageInput, retrieval_count: int = 0) -> Dict[str, Any]:
+    """
+    Full property set for a write. Writes replace the whole object, so the
+    caller passes the stored retrieval_count to carry it over (0 for new ids).
+    """
+    return {
         "message_id": msg.message_id,
         "workspace_id": msg.workspace_id,
         "channel_id": msg.channel_id,
@@ -118,101 +218,517 @@ def _upsert_message(msg: MessageInput) -> None:
         "text": msg.text,
         "ts": msg.ts,
         "topics": msg.topics or [],
+        "importance": msg.importance,
+        "retrieval_count": retrieval_count,
     }
 
-    try:
-        collection = weaviate_client.collections.get(WEAVIATE_CLASS_NAME)
-    except WeaviateBaseError as e:
-        logger.error("Error getting Weaviate collection %s: %s", WEAVIATE_CLASS_NAME, e, exc_info=True)
-        raise
+
+def _upsert_message(msg: MessageInput, retrieval_count: Optional[int] = None) -> None:
+    """
+    Create or update a Weaviate object for this message, keeping its stored
+    retrieval_count (looked up unless the caller already has it).
+    """
+    weaviate_id = _message_uuid(msg)
+    if retrieval_count is None:
+        retrieval_count = _stored_retrieval_counts([weaviate_id]).get(weaviate_id, 0)
+    data = _message_properties(msg, retrieval_count)
+
+    collection = get_collection()
 
     try:
-        # Try updating first
-        collection.data.update(
+        # replace() is a PUT by UUID, which Weaviate treats as an upsert
+        collection.data.replace(
             uuid=weaviate_id,
             properties=data,
         )
-        logger.info("Updated existing Weaviate object %s", weaviate_id)
-
+        logger.debug("Upserted Weaviate object %s", weaviate_id)
     except WeaviateBaseError as e:
-        # If the error indicates "not found", fall back to insert.
-        # You can inspect attributes like e.status_code or e.message depending on the exception class.
-        msg_text = str(e)
-        if "404" in msg_text or "not found" in msg_text.lower():
-            logger.info("Object %s not found, inserting instead", weaviate_id)
-            try:
-                collection.data.insert(
+        if getattr(e, "status_code", None) != 404:
+            logger.error("Error upserting object in Weaviate: %s", e, exc_info=True)
+            raise
+        # Older servers reject PUT for unknown ids; insert instead.
+        collection.data.insert(
+            uuid=weaviate_id,
+            properties=data,
+        )
+        logger.debug("Inserted new Weaviate object %s", weaviate_id)
+
+
+# Ids already stored in Weaviate, streamed from the collection at startup and
+# extended on every write. A hit means "probably stored" (false-positive rate
+# KNOWN_IDS_ERROR_RATE) and is confirmed against Weaviate before skipping; a
+# miss is definite. Nothing is skipped until loaded.
+_known_ids = ScalableBloomFilter(
+    initial_capacity=KNOWN_IDS_INITIAL_CAPACITY,
+    error_rate=KNOWN_IDS_ERROR_RATE,
+    mode=ScalableBloomFilter.LARGE_SET_GROWTH,
+)
+_known_ids_lock = threading.Lock()
+_known_ids_ready = threading.Event()
+
+
+def _load_known_ids() -> None:
+    """Populate _known_ids from every object id in the collection (blocking)."""
+    try:
+        chunk: List[str] = []
+        total = 0
+        for obj in get_collection().iterator(return_properties=[]):
+            chunk.append(str(obj.uuid))
+            if len(chunk) >= 10_000:
+                with _known_ids_lock:
+                    for weaviate_id in chunk:
+                        _known_ids.add(weaviate_id)
+                total += len(chunk)
+                chunk = []
+        with _known_ids_lock:
+            for weaviate_id in chunk:
+                _known_ids.add(weaviate_id)
+        total += len(chunk)
+        _known_ids_ready.set()
+        logger.info("Loaded %d known Weaviate ids into Bloom filter", total)
+    except Exception:
+        logger.exception("Failed to load known Weaviate ids; skip_existing disabled")
+
+
+def _fetch_properties_by_id(ids: List[str], properties: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Stored properties for whichever of ids exist, keyed by id (batched id lookups, blocking)."""
+    collection = get_collection()
+    found: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(ids), ID_LOOKUP_CHUNK):
+        chunk = ids[start:start + ID_LOOKUP_CHUNK]
+        response = collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any(chunk),
+            limit=len(chunk),
+            return_properties=properties,
+        )
+        for obj in response.objects:
+            found[str(obj.uuid)] = obj.properties
+    return found
+
+
+def _confirm_existing_ids(ids: List[str]) -> Set[str]:
+    """Return the subset of ids that really exist in Weaviate (blocking)."""
+    return set(_fetch_properties_by_id(ids, []))
+
+
+def _stored_retrieval_counts(ids: List[str]) -> Dict[str, int]:
+    """retrieval_count of each stored id; ids not yet stored are absent (blocking)."""
+    return {
+        weaviate_id: int(props.get("retrieval_count") or 0)
+        for weaviate_id, props in _fetch_properties_by_id(ids, ["retrieval_count"]).items()
+    }
+
+
+# The cached collection's batch wrapper keeps a single shared batch and
+# failed_objects list, so overlapping batches would read each other's
+# failures. Batch upserts (and the retrieval_count flush, which must not land
+# between an upsert's count read and its write) run one at a time.
+_batch_upsert_lock = threading.Lock()
+
+
+def _batch_upsert_messages(messages: List[MessageInput], skip_existing: bool = False) -> Tuple[int, int]:
+    """
+    Upsert messages through a dynamic Weaviate batch, which sizes requests
+    from the server's queue depth. Batch writes are idempotent by UUID, so new
+    and existing objects go through the same path.
+
+    Objects the batch reports as failed (typically rate-limit / queue-full
+    rejections) are resent in fixed-size batches, halving the size each round;
+    whatever still fails after BATCH_RETRY_ROUNDS falls back to per-object upserts.
+
+    Batch writes replace whole objects, so stored retrieval_counts are read
+    first (one batched lookup) and written back with the new properties.
+
+    With skip_existing, ids the known-id Bloom filter has seen are confirmed
+    with one batched existence lookup and only the confirmed ones are dropped;
+    false positives are written as usual. Returns (upserted, skipped).
+    """
+    collection = get_collection()
+    by_uuid: Dict[str, MessageInput] = {_message_uuid(msg): msg for msg in messages}
+
+    skipped = 0
+    if skip_existing and _known_ids_ready.is_set():
+        with _known_ids_lock:
+            maybe_stored = [wid for wid in by_uuid if wid in _known_ids]
+        if maybe_stored:
+            stored = _confirm_existing_ids(maybe_stored)
+            if len(stored) < len(maybe_stored):
+                logger.debug("%d Bloom filter hits were false positives", len(maybe_stored) - len(stored))
+            by_uuid = {wid: msg for wid, msg in by_uuid.items() if wid not in stored}
+            skipped = len(stored)
+        if not by_uuid:
+            return 0, skipped
+
+    with _batch_upsert_lock:
+        _write_batch(collection, by_uuid)
+
+    with _known_ids_lock:
+        for weaviate_id in by_uuid:
+            _known_ids.add(weaviate_id)
+
+    return len(by_uuid), skipped
+
+
+def _write_batch(collection, by_uuid: Dict[str, MessageInput]) -> None:
+    """Batch write + halving retries + per-object fallback; caller holds _batch_upsert_lock."""
+    counts = _stored_retrieval_counts(list(by_uuid))
+
+    with collection.batch.dynamic() as batch:
+        for weaviate_id, msg in by_uuid.items():
+            batch.add_object(uuid=weaviate_id, properties=_message_properties(msg, counts.get(weaviate_id, 0)))
+    pending = [str(err.object_.uuid) for err in collection.batch.failed_objects]
+
+    batch_size = BATCH_RETRY_SIZE
+    for _ in range(BATCH_RETRY_ROUNDS):
+        if not pending:
+            break
+        logger.warning("%d objects failed in batch upsert, retrying with batch_size=%d", len(pending), batch_size)
+        with collection.batch.fixed_size(batch_size=batch_size) as batch:
+            for weaviate_id in pending:
+                batch.add_object(
                     uuid=weaviate_id,
-                    properties=data,
+                    properties=_message_properties(by_uuid[weaviate_id], counts.get(weaviate_id, 0)),
                 )
-                logger.info("Inserted new Weaviate object %s", weaviate_id)
-            except WeaviateBaseError as inner:
-                logger.error("Error inserting object into Weaviate: %s", inner, exc_info=True)
-                raise
-        else:
-            logger.error("Error updating object in Weaviate: %s", e, exc_info=True)
-            raise
+        pending = [str(err.object_.uuid) for err in collection.batch.failed_objects]
+        batch_size = max(1, batch_size // 2)
+
+    for weaviate_id in pending:
+        _upsert_message(by_uuid[weaviate_id], counts.get(weaviate_id, 0))
 
 
-def _build_where_filter(workspace_id: str, min_ts: float) -> Dict[str, Any]:
+@lru_cache(maxsize=1024)
+def _build_where_filter(workspace_id: Optional[str], min_ts_hour: int) -> Filter:
     """
-    Build a Weaviate 'where' filter combining workspace_id and time window.
+    Build a Weaviate filter combining workspace_id (if given) and time window.
+    The window start is bucketed to the hour so concurrent and repeated
+    requests share one cached Filter object.
     """
-    filters: List[Dict[str, Any]] = [
-        {
-            "path": ["workspace_id"],
-            "operator": "Equal",
-            "valueString": workspace_id,
-        },
-        {
-            "path": ["ts"],
-            "operator": "GreaterThanEqual",
-            "valueNumber": min_ts,
-        },
+    where = Filter.by_property("ts").greater_or_equal(float(min_ts_hour * 3600))
+    if workspace_id:
+        where = Filter.by_property("workspace_id").equal(workspace_id) & where
+    return where
+
+
+_ollama = httpx.Client(base_url=OLLAMA_API_ENDPOINT, timeout=30.0)
+
+
+@lru_cache(maxsize=4096)
+def _embed_query(text: str) -> Tuple[float, ...]:
+    """
+    Embed a query string with the Ollama model directly (blocking). Cached, so
+    repeated queries skip the embedding model entirely; tuple keeps it immutable.
+    """
+    resp = _ollama.post("/api/embed", json={"model": OLLAMA_EMBED_MODEL, "input": text})
+    resp.raise_for_status()
+    return tuple(resp.json()["embeddings"][0])
+
+
+def _query_near_vector(
+    where_filter: Filter, vector: Tuple[float, ...], limit: int, min_certainty: float = 0.0
+) -> List[Dict[str, Any]]:
+    """
+    Run a nearVector query and return hits as property dicts with an
+    '_additional' entry holding id / certainty / distance (blocking).
+    min_certainty is enforced by Weaviate, so weaker matches are never sent back.
+    """
+    collection = get_collection()
+    response = collection.query.near_vector(
+        near_vector=list(vector),
+        certainty=min_certainty or None,
+        filters=where_filter,
+        limit=limit,
+        return_properties=SEARCH_PROPERTIES,
+        return_metadata=MetadataQuery(certainty=True, distance=True),
+    )
+    hits: List[Dict[str, Any]] = []
+    for obj in response.objects:
+        additional: Dict[str, Any] = {"id": str(obj.uuid)}
+        if obj.metadata.certainty is not None:
+            additional["certainty"] = obj.metadata.certainty
+        if obj.metadata.distance is not None:
+            additional["distance"] = obj.metadata.distance
+        hits.append({**obj.properties, "_additional": additional})
+    return hits
+
+
+def _query_bm25(where_filter: Filter, query_text: str, limit: int) -> List[Dict[str, Any]]:
+    """Run a BM25 keyword query and return hits in the same shape as _query_near_vector (blocking)."""
+    collection = get_collection()
+    response = collection.query.bm25(
+        query=query_text,
+        filters=where_filter,
+        limit=limit,
+        return_properties=SEARCH_PROPERTIES,
+        return_metadata=MetadataQuery(score=True),
+    )
+    return [
+        {**obj.properties, "_additional": {"id": str(obj.uuid), "score": obj.metadata.score}}
+        for obj in response.objects
     ]
 
-    return {
-        "operator": "And",
-        "operands": filters,
+
+def _query_recent(where_filter: Filter, limit: int) -> List[Dict[str, Any]]:
+    """Newest messages matching the filter, ordered server-side by ts (blocking)."""
+    collection = get_collection()
+    response = collection.query.fetch_objects(
+        filters=where_filter,
+        sort=Sort.by_property("ts", ascending=False),
+        limit=limit,
+        return_properties=SEARCH_PROPERTIES,
+    )
+    return [
+        {**obj.properties, "_additional": {"id": str(obj.uuid)}}
+        for obj in response.objects
+    ]
+
+
+def _rrf_merge(*ranked_lists: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge ranked hit lists with Reciprocal Rank Fusion (sum of 1/(k+rank)),
+    deduplicating on Weaviate id. The fused score is normalized to [0, 1] by the
+    best achievable score and stored as _additional['rrf_score'].
+    """
+    scores: Dict[str, float] = {}
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for hits in ranked_lists:
+        for rank, hit in enumerate(hits, start=1):
+            hit_id = hit["_additional"]["id"]
+            scores[hit_id] = scores.get(hit_id, 0.0) + 1.0 / (RRF_K + rank)
+            by_id.setdefault(hit_id, hit)
+
+    best = len(ranked_lists) / (RRF_K + 1) if ranked_lists else 1.0
+    for hit_id, hit in by_id.items():
+        hit["_additional"]["rrf_score"] = scores[hit_id] / best
+    return sorted(by_id.values(), key=lambda h: h["_additional"]["rrf_score"], reverse=True)
+
+
+async def _search_vector(where_filter: Filter, query_text: str, limit: int, min_score: float) -> List[Dict[str, Any]]:
+    # Embedding and Weaviate calls are blocking; keep them off the event loop
+    vector = await asyncio.to_thread(_embed_query, query_text)
+    return await asyncio.to_thread(_query_near_vector, where_filter, vector, limit, min_score)
+
+
+async def _search_bm25(where_filter: Filter, query_text: str, limit: int) -> List[Dict[str, Any]]:
+    return await asyncio.to_thread(_query_bm25, where_filter, query_text, limit)
+
+
+async def _search_recent(where_filter: Filter, limit: int) -> List[Dict[str, Any]]:
+    return await asyncio.to_thread(_query_recent, where_filter, limit)
+
+
+async def _retrieve_hits(
+    where_filter: Filter, query_text: str, limit: int, min_score: float, include_recent: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Fan out vector and BM25 retrieval concurrently and fuse them with RRF, so
+    latency is the slowest branch rather than the sum. With include_recent,
+    the newest messages in the window (sorted by Weaviate) join the fusion as
+    a third ranking, which lets recency-heavy searches use a small limit
+    instead of over-fetching.
+
+    min_score is a vector certainty floor: Weaviate enforces it on the vector
+    branch, and when it is > 0 the fused list keeps only hits that branch
+    returned. Keyword/recent rankings then only reorder certain-enough hits.
+
+    If a branch fails the others' results are still used; only a failure of
+    every branch (or of the vector branch while a floor is set) is surfaced.
+    """
+    branches = {
+        "vector": _search_vector(where_filter, query_text, limit, min_score),
+        "bm25": _search_bm25(where_filter, query_text, limit),
     }
+    if include_recent:
+        branches["recent"] = _search_recent(where_filter, limit)
 
+    results = await asyncio.gather(*branches.values(), return_exceptions=True)
 
-def _compute_recency_score(ts: float, min_ts: float, now_ts: float) -> float:
+    ranked: List[List[Dict[str, Any]]] = []
+    errors: List[BaseException] = []
+    for name, result in zip(branches, results):
+        if isinstance(result, BaseException):
+            logger.error("%s retrieval failed: %s", name, result)
+            errors.append(result)
+        else:
+            ranked.append(result)
+
+    vector_result = results[0]
+    if not ranked or (min_score > 0 and isinstance(vector_result, BaseException)):
+        e = vector_result if isinstance(vector_result, BaseException) else errors[0]
+        if isinstance(e, httpx.HTTPError):
+            raise HTTPException(status_code=502, detail=f"Embedding error: {e}")
+        raise HTTPException(status_code=500, detail=f"Weaviate query error: {e}")
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Weaviate returned %s raw hits", "+".join(str(len(r)) for r in ranked))
+    fused = _rrf_merge(*ranked)
+
+    if min_score > 0:
+        certain_ids = {hit["_additional"]["id"] for hit in vector_result}
+        fused = [hit for hit in fused if hit["_additional"]["id"] in certain_ids]
+    return fused
+
+
+@lru_cache(maxsize=32)
+def _recency_lut(half_life_days: float) -> np.ndarray:
     """
-    Normalize recency between 0 and 1 based on [min_ts, now_ts].
+    2^(-age_days / half_life_days) precomputed per day of age up to the max
+    search window (timeframe_days <= 365), with a trailing 0.0 for anything older.
     """
-    if ts <= min_ts:
-        return 0.0
-    if ts >= now_ts:
-        return 1.0
-    return (ts - min_ts) / (now_ts - min_ts + 1e-9)
+    days = np.arange(366, dtype=np.float64)
+    return np.append(np.exp2(-days / half_life_days), 0.0)
 
 
-def _extract_semantic_score(additional: Dict[str, Any]) -> float:
+def _compute_recency_scores(ts: np.ndarray, now_ts: float, half_life_days: float) -> np.ndarray:
     """
-    Weaviate _additional can contain 'certainty' or 'distance'. We prefer certainty (0-1).
-    If only distance exists, convert it to a pseudo-score.
+    Exponential half-life decay in [0, 1]. Age is bucketed to whole days and
+    looked up in a precomputed table; future timestamps count as age 0.
     """
-    if "certainty" in additional:
-        return float(additional["certainty"])
+    lut = _recency_lut(half_life_days)
+    age_days = np.floor_divide(now_ts - ts, 86400).astype(np.int64)
+    return lut[np.clip(age_days, 0, len(lut) - 1)]
+
 
-    # If distance is cosine distance, we can approximate: score = 1 - distance
-    if "distance" in additional:
+def _rerank(
+    hits: List[Dict[str, Any]], now_ts: float, req: SearchRequest
+) -> Tuple[List[SearchResultItem], List[Dict[str, Any]]]:
+    """
+    Score hits on fused relevance, recency, retrieval frequency and importance,
+    and return the top_k result items (best first) with their source hits.
+
+    Weights are ratios (normalized by their sum); the blended score is then
+    z-scored across the candidates and squashed with a sigmoid, so final_score
+    is in (0, 1) regardless of the weight scale. Scoring is vectorized and
+    selection uses argpartition (O(n)); result items are only built for the
+    hits that survive.
+    """
+    n = len(hits)
+    if n == 0:
+        return [], []
+
+    # Fused vector + keyword relevance, in [0, 1]
+    sem = np.fromiter((h["_additional"]["rrf_score"] for h in hits), dtype=np.float64, count=n)
+    ts = np.fromiter((float(h.get("ts") or 0.0) for h in hits), dtype=np.float64, count=n)
+    counts = np.fromiter((h.get("retrieval_count") or 0 for h in hits), dtype=np.float64, count=n)
+    imp = np.fromiter((h.get("importance") or 0.0 for h in hits), dtype=np.float64, count=n)
+
+    recency = _compute_recency_scores(ts, now_ts, req.recency_half_life_days)
+    freq = np.minimum(1.0, np.log1p(counts) / 10.0)
+
+    weights = (1.0 - req.recency_weight, req.recency_weight, req.frequency_weight, req.importance_weight)
+    total = sum(weights) or 1.0
+    blended = (weights[0] * sem + weights[1] * recency + weights[2] * freq + weights[3] * imp) / total
+    z = (blended - blended.mean()) / (blended.std() + 1e-9)
+    final = 1.0 / (1.0 + np.exp(-z))
+
+    top_k = req.top_k
+    if top_k < n:
+        idx = np.argpartition(-final, top_k)[:top_k]
+    else:
+        idx = np.arange(n)
+    idx = idx[np.argsort(-final[idx], kind="stable")]
+
+    # Items are built from values we just produced, so skip field validation
+    results: List[SearchResultItem] = []
+    selected: List[Dict[str, Any]] = []
+    for i in idx:
+        hit = hits[i]
+        selected.append(hit)
+        results.append(
+            SearchResultItem.model_construct(
+                message_id=hit.get("message_id"),
+                workspace_id=hit.get("workspace_id"),
+                channel_id=hit.get("channel_id"),
+                user_id=hit.get("user_id"),
+                text=hit.get("text"),
+                ts=float(ts[i]),
+                topics=hit.get("topics", []),
+                retrieval_count=int(counts[i]),
+                importance=float(imp[i]),
+                semantic_score=float(sem[i]),
+                recency_score=float(recency[i]),
+                final_score=float(final[i]),
+            )
+        )
+    return results, selected
+
+
+# retrieval_count increments accumulated per Weaviate id since the last flush.
+# Summing in memory means concurrent searches never lose increments to each
+# other, and each object gets at most one write per RETRIEVAL_FLUSH_INTERVAL_S.
+_pending_retrievals: Dict[str, int] = {}
+_pending_retrievals_lock = threading.Lock()
+
+
+def _record_retrievals(hits: List[Dict[str, Any]]) -> None:
+    """Queue a retrieval_count increment for each returned hit (non-blocking)."""
+    if not hits:
+        return
+    with _pending_retrievals_lock:
+        for hit in hits:
+            hit_id = hit["_additional"]["id"]
+            _pending_retrievals[hit_id] = _pending_retrievals.get(hit_id, 0) + 1
+
+
+def _flush_retrieval_counts() -> None:
+    """
+    Apply queued increments (blocking; best effort). Current counts are read
+    in batched by-id fetches right before the per-object PATCH, so
+    counts stay exact within this process; with several workers writing the
+    same object they are approximate.
+    """
+    with _pending_retrievals_lock:
+        pending = dict(_pending_retrievals)
+        _pending_retrievals.clear()
+    if not pending:
+        return
+
+    collection = get_collection()
+    with _batch_upsert_lock:
         try:
-            dist = float(additional["distance"])
-            return max(0.0, min(1.0, 1.0 - dist))
-        except (TypeError, ValueError):
-            pass
+            current = _stored_retrieval_counts(list(pending))
+        except WeaviateBaseError as e:
+            logger.warning("Failed to read retrieval_count for %d objects: %s", len(pending), e)
+            return
+        for weaviate_id, count in current.items():
+            try:
+                collection.data.update(
+                    uuid=weaviate_id,
+                    properties={"retrieval_count": count + pending[weaviate_id]},
+                )
+            except WeaviateBaseError as e:
+                logger.warning("Failed to update retrieval_count for %s: %s", weaviate_id, e)
+
 
-    # Fallback
-    return 0.0
+async def _flush_retrievals_periodically() -> None:
+    while True:
+        await asyncio.sleep(RETRIEVAL_FLUSH_INTERVAL_S)
+        try:
+            await asyncio.to_thread(_flush_retrieval_counts)
+        except Exception:
+            logger.exception("retrieval_count flush failed")
 
 
 # ------------------------------------------------------------
 # FastAPI app
 # ------------------------------------------------------------
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the known-id filter in the background so startup isn't blocked on
+    # scanning the whole collection.
+    threading.Thread(target=_load_known_ids, name="known-ids-loader", daemon=True).start()
+    flusher = asyncio.create_task(_flush_retrievals_periodically())
+    yield
+    flusher.cancel()
+    try:
+        await flusher
+    except asyncio.CancelledError:
+        pass
+    await asyncio.to_thread(_flush_retrieval_counts)
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Semantic Search MCP Server",
     description=(
         "MCP-style server wrapping a Weaviate vector DB. "
@@ -221,13 +737,14 @@ app = FastAPI(
         "- search_similar: semantic search with recency-aware ranking and tuning knobs"
     ),
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
-@app.get("/tools/sample_messages", response_model=List)
+@app.get("/tools/sample_messages", response_model=List[Dict[str, Any]])
 def tool_sample_messages():
     """
     MCP Tool: sample_messages
@@ -257,13 +774,12 @@ def tool_sample_messages():
 
     query_vector = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8]  # same dimension as your embeddings
 
-    collection = weaviate_client.collections.get(WEAVIATE_CLASS_NAME)
+    collection = get_collection()
     results = collection.query.fetch_objects(
         limit=20  # adjust as needed
     )
 
-    for obj in results.objects:
-        print(obj.uuid, obj.properties)
+    logger.debug("Sampled objects: %r", results.objects)
 
     # results = collection.query.near_vector(
     #     near_vector=query_vector,
@@ -273,11 +789,12 @@ def tool_sample_messages():
 
     # for o in results.objects:
     #     print(o.uuid, o.properties, o.distance)
-    return results.objects
+    # Properties only, not the full v4 object graph (metadata, vectors, references)
+    return [obj.properties for obj in results.objects]
 
 
 @app.post("/tools/embed_and_upsert", response_model=EmbedAndUpsertResponse)
-def tool_embed_and_upsert(req: EmbedAndUpsertRequest):
+async def tool_embed_and_upsert(req: EmbedAndUpsertRequest):
     """
     MCP Tool: embed_and_upsert
 
@@ -287,35 +804,32 @@ def tool_embed_and_upsert(req: EmbedAndUpsertRequest):
     if not req.messages:
         return EmbedAndUpsertResponse(upserted_count=0)
 
-    count = 0
     start = time.time()
 
     try:
-        for msg in req.messages:
-            _upsert_message(msg)
-            count += 1
+        # Whole batch context runs in a worker thread so searches can proceed meanwhile
+        count, skipped = await asyncio.to_thread(_batch_upsert_messages, req.messages, req.skip_existing)
     except Exception as e:
         logger.exception("Error during embed_and_upsert")
         raise HTTPException(status_code=500, detail=str(e))
 
     elapsed = time.time() - start
-    logger.info("Upserted %d messages into Weaviate in %.2fs", count, elapsed)
-    return EmbedAndUpsertResponse(upserted_count=count)
+    logger.info("Upserted %d messages into Weaviate in %.2fs (%d skipped)", count, elapsed, skipped)
+    return EmbedAndUpsertResponse(upserted_count=count, skipped_count=skipped)
 
 
-@app.post("/tools/fetch_relevant_messages", response_model=SearchResponse)
-def tool_fetch_relevant_messages(req: SearchRequest):
+async def _do_search(req: SearchRequest) -> SearchResponse:
     """
-    MCP Tool: fetch_relevant_messages
+    Shared implementation of the search tools.
 
-    Perform a semantic search in Weaviate for messages relevant to the user,
-    restricted to a workspace and timeframe, and re-ranked by recency.
-
-    The final_score is:
+    Candidates come from a vector search and a BM25 keyword search run in
+    parallel and fused with Reciprocal Rank Fusion. Candidates are scored on
         (1 - recency_weight) * semantic_score + recency_weight * recency_score
-    where semantic_score and recency_score are both in [0, 1].
+        + frequency_weight * frequency + importance_weight * importance
+    (weights normalized by their sum), where semantic_score is the normalized
+    fused relevance and all signals are in [0, 1]. The blend is z-scored across
+    candidates and passed through a sigmoid to give final_score.
     """
-    return SearchResponse(results=[])
     if not req.query and not req.topics:
         raise HTTPException(
             status_code=400,
@@ -323,207 +837,59 @@ def tool_fetch_relevant_messages(req: SearchRequest):
         )
 
     now_ts = time.time()
-    min_ts = now_ts - req.timeframe_days * 86400
+    min_ts_hour = int(now_ts - req.timeframe_days * 86400) // 3600
 
-    where_filter = _build_where_filter(req.workspace_id, min_ts)
+    where_filter = _build_where_filter(req.workspace_id, min_ts_hour)
 
-    # Concepts for nearText
+    # Concepts to embed; sorted so equivalent requests share an embedding cache entry
     concepts: List[str] = []
     if req.query:
         concepts.append(req.query)
     if req.topics:
         concepts.extend(req.topics)
+    query_text = "\n".join(sorted(concepts))
 
-    near_text: Dict[str, Any] = {
-        "concepts": concepts,
-    }
-
-    # We fetch somewhat more results than top_k, then apply additional filtering
-    # and re-ranking in Python.
-    raw_limit = min(req.top_k * 3, 200)
-
-    try:
-        gql_response = (
-            weaviate_client.query
-            .get(
-                WEAVIATE_CLASS_NAME,
-                [
-                    "message_id",
-                    "workspace_id",
-                    "channel_id",
-                    "user_id",
-                    "text",
-                    "ts",
-                    "topics",
-                ],
-            )
-            .with_where(where_filter)
-            .with_near_text(near_text)
-            .with_limit(raw_limit)
-            .with_additional(["id", "certainty", "distance"])
-            .do()
-        )
-    except WeaviateBaseError as e:
-        logger.error("Weaviate query error: %s", e)
-        raise HTTPException(status_code=500, detail=f"Weaviate query error: {e}")
-
-    hits = (
-        gql_response
-        .get("data", {})
-        .get("Get", {})
-        .get(WEAVIATE_CLASS_NAME, [])
-    )
-
-    logger.info("Weaviate returned %d raw hits", len(hits))
+    # We fetch somewhat more results than top_k, then re-rank in Python. With a
+    # strict min_score few candidates survive Weaviate's cutoff anyway.
+    # Recency-heavy searches pull the newest top_k server-side instead, so they
+    # don't need the over-fetch either.
+    recency_heavy = req.recency_weight > 0.5
+    if req.min_score > 0.6 or recency_heavy:
+        raw_limit = req.top_k
+    else:
+        raw_limit = min(req.top_k * 3, 200)
 
-    scored_results: List[SearchResultItem] = []
+    hits = await _retrieve_hits(where_filter, query_text, raw_limit, req.min_score, include_recent=recency_heavy)
 
-    for hit in hits:
-        additional = hit.get("_additional", {})
-        semantic_score = _extract_semantic_score(additional)
-        if semantic_score < req.min_score:
-            continue
+    top_results, top_hits = _rerank(hits, now_ts, req)
+    _record_retrievals(top_hits)
 
-        ts_val = float(hit.get("ts", 0.0))
-        recency_score = _compute_recency_score(ts_val, min_ts, now_ts)
+    logger.debug("Returning %d ranked results", len(top_results))
+    return SearchResponse.model_construct(results=top_results)
 
-        final_score = (
-            (1.0 - req.recency_weight) * semantic_score
-            + req.recency_weight * recency_score
-        )
-
-        scored_results.append(
-            SearchResultItem(
-                message_id=hit.get("message_id"),
-                workspace_id=hit.get("workspace_id"),
-                channel_id=hit.get("channel_id"),
-                user_id=hit.get("user_id"),
-                text=hit.get("text"),
-                ts=ts_val,
-                topics=hit.get("topics", []),
-                semantic_score=semantic_score,
-                recency_score=recency_score,
-                final_score=final_score,
-            )
-        )
 
-    # Sort by final_score descending and truncate to top_k
-    scored_results.sort(key=lambda r: r.final_score, reverse=True)
-    top_results = scored_results[: req.top_k]
+@app.post("/tools/fetch_relevant_messages", response_model=None, responses={200: {"model": SearchResponse}})
+async def tool_fetch_relevant_messages(req: SearchRequest):
+    """
+    MCP Tool: fetch_relevant_messages
 
-    logger.info("Returning %d ranked results", len(top_results))
-    return SearchResponse(results=top_results)
+    Perform a semantic search in Weaviate for messages relevant to the user,
+    restricted to a workspace and timeframe, and re-ranked by recency.
+    See _do_search for the scoring.
+    """
+    return await _do_search(req)
 
 
-@app.post("/tools/search_similar", response_model=SearchResponse)
-def tool_search_similar(req: SearchRequest):
+@app.post("/tools/search_similar", response_model=None, responses={200: {"model": SearchResponse}})
+async def tool_search_similar(req: SearchRequest):
     """
     MCP Tool: search_similar
 
     Perform a semantic search in Weaviate for messages relevant to the query/topics,
     restricted to a workspace and timeframe, and re-ranked by recency.
-
-    The final_score is:
-        (1 - recency_weight) * semantic_score + recency_weight * recency_score
-    where semantic_score and recency_score are both in [0, 1].
+    See _do_search for the scoring.
     """
-    if not req.query and not req.topics:
-        raise HTTPException(
-            status_code=400,
-            detail="Either 'query' or 'topics' must be provided.",
-        )
-
-    now_ts = time.time()
-    min_ts = now_ts - req.timeframe_days * 86400
-
-    where_filter = _build_where_filter(req.workspace_id, min_ts)
-
-    # Concepts for nearText
-    concepts: List[str] = []
-    if req.query:
-        concepts.append(req.query)
-    if req.topics:
-        concepts.extend(req.topics)
-
-    near_text: Dict[str, Any] = {
-        "concepts": concepts,
-    }
-
-    # We fetch somewhat more results than top_k, then apply additional filtering
-    # and re-ranking in Python.
-    raw_limit = min(req.top_k * 3, 200)
-
-    try:
-        gql_response = (
-            weaviate_client.query
-            .get(
-                WEAVIATE_CLASS_NAME,
-                [
-                    "message_id",
-                    "workspace_id",
-                    "channel_id",
-                    "user_id",
-                    "text",
-                    "ts",
-                    "topics",
-                ],
-            )
-            .with_where(where_filter)
-            .with_near_text(near_text)
-            .with_limit(raw_limit)
-            .with_additional(["id", "certainty", "distance"])
-            .do()
-        )
-    except WeaviateBaseError as e:
-        logger.error("Weaviate query error: %s", e)
-        raise HTTPException(status_code=500, detail=f"Weaviate query error: {e}")
-
-    hits = (
-        gql_response
-        .get("data", {})
-        .get("Get", {})
-        .get(WEAVIATE_CLASS_NAME, [])
-    )
-
-    logger.info("Weaviate returned %d raw hits", len(hits))
-
-    scored_results: List[SearchResultItem] = []
-
-    for hit in hits:
-        additional = hit.get("_additional", {})
-        semantic_score = _extract_semantic_score(additional)
-        if semantic_score < req.min_score:
-            continue
-
-        ts_val = float(hit.get("ts", 0.0))
-        recency_score = _compute_recency_score(ts_val, min_ts, now_ts)
-
-        final_score = (
-            (1.0 - req.recency_weight) * semantic_score
-            + req.recency_weight * recency_score
-        )
-
-        scored_results.append(
-            SearchResultItem(
-                message_id=hit.get("message_id"),
-                workspace_id=hit.get("workspace_id"),
-                channel_id=hit.get("channel_id"),
-                user_id=hit.get("user_id"),
-                text=hit.get("text"),
-                ts=ts_val,
-                topics=hit.get("topics", []),
-                semantic_score=semantic_score,
-                recency_score=recency_score,
-                final_score=final_score,
-            )
-        )
-
-    # Sort by final_score descending and truncate to top_k
-    scored_results.sort(key=lambda r: r.final_score, reverse=True)
-    top_results = scored_results[: req.top_k]
-
-    logger.info("Returning %d ranked results", len(top_results))
-    return SearchResponse(results=top_results)
+    return await _do_search(req)
 
 
 # ------------------------------------------------------------
@@ -533,10 +899,7 @@ def tool_search_similar(req: SearchRequest):
 if __name__ == "__main__":
     import uvicorn
 
-    from vector_db import get_weaviate_client
-
-    client = get_weaviate_client()
-    collection = client.collections.get(WEAVIATE_CLASS_NAME)
+    get_collection()  # connect (with retries) before serving
 
     uvicorn.run(
         "semantic_search_mcp_server:app",
@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+# The server imports its siblings as top-level modules (e.g. `vector_db`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import semantic_search_mcp_server as server  # noqa: E402
+
+
+class FakeBatch:
+    """Collects add_object calls; writes replace whole objects, like Weaviate."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self._staged = []
+
+    def add_object(self, uuid, properties):
+        self._staged.append((str(uuid), dict(properties)))
+
+
+class FakeBatchManager:
+    """
+    Mirrors the real wrapper's shared state: every dynamic()/fixed_size()
+    resets the one failed_objects list. Ids in fail_once are rejected the
+    first time they are sent; 'overlap_s' widens the window in which two
+    concurrent batches can interleave.
+    """
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.failed_objects = []
+        self.fail_once = set()
+        self.overlap_s = 0.0
+
+    @contextmanager
+    def _batch(self):
+        self.failed_objects = []
+        batch = FakeBatch(self._collection)
+        yield batch
+        time.sleep(self.overlap_s)
+        failed = []
+        for weaviate_id, properties in batch._staged:
+            if weaviate_id in self.fail_once:
+                self.fail_once.discard(weaviate_id)
+                failed.append(SimpleNamespace(object_=SimpleNamespace(uuid=uuid.UUID(weaviate_id))))
+            else:
+                self._collection.objects[weaviate_id] = properties
+        self.failed_objects.extend(failed)
+
+    def dynamic(self):
+        return self._batch()
+
+    def fixed_size(self, batch_size):
+        return self._batch()
+
+
+class FakeData:
+    def __init__(self, collection):
+        self._collection = collection
+
+    def replace(self, uuid, properties):
+        self._collection.objects[str(uuid)] = dict(properties)
+
+    def insert(self, uuid, properties):
+        self._collection.objects[str(uuid)] = dict(properties)
+
+    def update(self, uuid, properties):
+        self._collection.objects[str(uuid)].update(properties)
+
+
+class FakeQuery:
+    def __init__(self, collection):
+        self._collection = collection
+
+    def fetch_objects(self, filters, limit, return_properties):
+        # Only the by-id contains_any filter is used on the write paths
+        wanted = [str(v) for v in filters.value][:limit]
+        objects = [
+            SimpleNamespace(
+                uuid=uuid.UUID(weaviate_id),
+                properties={k: self._collection.objects[weaviate_id].get(k) for k in return_properties},
+            )
+            for weaviate_id in wanted
+            if weaviate_id in self._collection.objects
+        ]
+        return SimpleNamespace(objects=objects)
+
+
+class FakeCollection:
+    """In-memory stand-in for the parts of a Weaviate collection the upsert paths use."""
+
+    def __init__(self):
+        self.objects = {}
+        self.data = FakeData(self)
+        self.query = FakeQuery(self)
+        self.batch = FakeBatchManager(self)
+
+
+@pytest.fixture
+def fake_collection(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(server, "get_collection", lambda: collection)
+    server._pending_retrievals.clear()
+    return collection
+
+
+def make_message(channel_id="C67890", ts=1712000000.001, text="PCB rev B is back from fab", **kw):
+    return server.MessageInput(
+        message_id=kw.pop("message_id", f"{channel_id}-{ts}"),
+        workspace_id=kw.pop("workspace_id", "W12345"),
+        channel_id=channel_id,
+        user_id=kw.pop("user_id", "U12345"),
+        text=text,
+        ts=ts,
+        **kw,
+    )
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+import semantic_search_mcp_server as server
+
+from conftest import make_message
+
+
+def test_new_objects_start_with_zero_retrieval_count(fake_collection):
+    msg = make_message()
+
+    assert server._batch_upsert_messages([msg]) == (1, 0)
+
+    stored = fake_collection.objects[server._message_uuid(msg)]
+    assert stored["retrieval_count"] == 0
+
+
+def test_retrieval_count_survives_reupsert(fake_collection):
+    msg = make_message()
+    server._batch_upsert_messages([msg])
+    weaviate_id = server._message_uuid(msg)
+
+    hit = {"_additional": {"id": weaviate_id}}
+    server._record_retrievals([hit, hit])
+    server._flush_retrieval_counts()
+    assert fake_collection.objects[weaviate_id]["retrieval_count"] == 2
+
+    edited = make_message(text="PCB rev B is back from fab, bring-up tomorrow")
+    server._batch_upsert_messages([edited])
+
+    stored = fake_collection.objects[weaviate_id]
+    assert stored["text"] == edited.text
+    assert stored["retrieval_count"] == 2
+
+
+def test_single_object_upsert_keeps_retrieval_count(fake_collection):
+    msg = make_message()
+    server._batch_upsert_messages([msg])
+    weaviate_id = server._message_uuid(msg)
+    fake_collection.objects[weaviate_id]["retrieval_count"] = 5
+
+    server._upsert_message(make_message(text="edited"))
+
+    assert fake_collection.objects[weaviate_id]["retrieval_count"] == 5
+
+
+def test_concurrent_batch_upserts_keep_their_own_failures(fake_collection):
+    batch_a = [make_message(channel_id="CAAAA", ts=1712000000.0 + i) for i in range(5)]
+    batch_b = [make_message(channel_id="CBBBB", ts=1712000000.0 + i) for i in range(5)]
+    # Every object is rejected once, so both calls go through the retry path
+    fake_collection.batch.fail_once = {server._message_uuid(m) for m in batch_a + batch_b}
+    fake_collection.batch.overlap_s = 0.05
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(server._batch_upsert_messages, [batch_a, batch_b]))
+
+    assert results == [(5, 0), (5, 0)]
+    for msg in batch_a + batch_b:
+        assert fake_collection.objects[server._message_uuid(msg)]["channel_id"] == msg.channel_id
+
+
+def test_noncanonical_weaviate_id_is_normalized(fake_collection):
+    canonical = server._slack_key_to_uuid("C67890", 1712000000.001)
+    msg = make_message(weaviate_id=canonical.upper().replace("-", ""))
+    fake_collection.batch.fail_once = {canonical}
+
+    assert server._batch_upsert_messages([msg]) == (1, 0)
+    assert list(fake_collection.objects) == [canonical]
+
+
+def test_invalid_weaviate_id_is_rejected_with_422():
+    client = TestClient(server.app)
+    payload = {"messages": [{**make_message().model_dump(), "weaviate_id": "not-a-uuid"}]}
+
+    resp = client.post("/tools/embed_and_upsert", json=payload)
+
+    assert resp.status_code == 422
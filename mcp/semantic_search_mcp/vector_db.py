@@ -64,24 +64,68 @@
 
 
 # vector_db.py
+import os
 import time
 import logging
+import threading
 import weaviate
+from weaviate.classes.config import Configure, DataType, Property
+from weaviate.classes.init import AdditionalConfig, Timeout
+from weaviate.config import ConnectionConfig
 from weaviate.exceptions import WeaviateConnectionError
 
 logger = logging.getLogger(__name__)
 
 _WEAVIATE_CLIENT = None
+_COLLECTION = None
+# Request threads and the known-ids loader thread race on first use
+_INIT_LOCK = threading.Lock()
 
 WEAVIATE_CLASS_NAME = "Message"
 
+WEAVIATE_HOST = os.getenv("WEAVIATE_HOST", "weaviate")
+WEAVIATE_HTTP_PORT = int(os.getenv("WEAVIATE_HTTP_PORT", "8080"))
+WEAVIATE_GRPC_PORT = int(os.getenv("WEAVIATE_GRPC_PORT", "50051"))
+
+# Queries and batch imports go over gRPC; REST (schema, object writes) uses a
+# pooled keep-alive HTTP session sized for concurrent request handlers.
+WEAVIATE_ADDITIONAL_CONFIG = AdditionalConfig(
+    timeout=Timeout(init=10, query=30, insert=120),
+    connection=ConnectionConfig(session_pool_connections=20, session_pool_maxsize=40),
+)
+OLLAMA_API_ENDPOINT = os.getenv("OLLAMA_API_ENDPOINT", "http://ollama:11434")
+OLLAMA_EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+
+# Every property the semantic search server reads or writes. Missing ones are
+# added on startup so searches never request a property the schema lacks.
+MESSAGE_PROPERTIES = [
+    Property(name="message_id", data_type=DataType.TEXT),
+    Property(name="workspace_id", data_type=DataType.TEXT),
+    Property(name="channel_id", data_type=DataType.TEXT),
+    Property(name="user_id", data_type=DataType.TEXT),
+    Property(name="text", data_type=DataType.TEXT),
+    Property(name="ts", data_type=DataType.NUMBER),
+    Property(name="topics", data_type=DataType.TEXT_ARRAY),
+    Property(name="importance", data_type=DataType.NUMBER),
+    Property(name="retrieval_count", data_type=DataType.INT),
+]
+
+
 def init_weaviate(max_retries: int = 20, delay: float = 2.0):
     """Connect to Weaviate with retries, returns a live client."""
-    url = "http://weaviate:8080"
+    url = f"http://{WEAVIATE_HOST}:{WEAVIATE_HTTP_PORT} (grpc :{WEAVIATE_GRPC_PORT})"
     for attempt in range(1, max_retries + 1):
         try:
             logger.info("Connecting to Weaviate at %s (attempt %d/%d)", url, attempt, max_retries)
-            client = weaviate.connect_to_local(host="weaviate", port=8080)
+            client = weaviate.connect_to_custom(
+                http_host=WEAVIATE_HOST,
+                http_port=WEAVIATE_HTTP_PORT,
+                http_secure=False,
+                grpc_host=WEAVIATE_HOST,
+                grpc_port=WEAVIATE_GRPC_PORT,
+                grpc_secure=False,
+                additional_config=WEAVIATE_ADDITIONAL_CONFIG,
+            )
             # Simple ping to confirm it’s really up
             client.collections.list_all()
             logger.info("Connected to Weaviate successfully.")
@@ -96,9 +140,45 @@ def init_weaviate(max_retries: int = 20, delay: float = 2.0):
             raise
         time.sleep(delay)
 
+def ensure_schema(client) -> None:
+    """Create the messages collection if missing, else add any missing properties."""
+    if not client.collections.exists(WEAVIATE_CLASS_NAME):
+        client.collections.create(
+            name=WEAVIATE_CLASS_NAME,
+            properties=MESSAGE_PROPERTIES,
+            vector_config=Configure.Vectors.text2vec_ollama(
+                api_endpoint=OLLAMA_API_ENDPOINT,
+                model=OLLAMA_EMBED_MODEL,
+            ),
+        )
+        logger.info("Created collection %s", WEAVIATE_CLASS_NAME)
+        return
+
+    collection = client.collections.get(WEAVIATE_CLASS_NAME)
+    existing = {prop.name for prop in collection.config.get().properties}
+    for prop in MESSAGE_PROPERTIES:
+        if prop.name not in existing:
+            collection.config.add_property(prop)
+            logger.info("Added property %s to collection %s", prop.name, WEAVIATE_CLASS_NAME)
+
 def get_weaviate_client():
     """Lazy global singleton."""
     global _WEAVIATE_CLIENT
     if _WEAVIATE_CLIENT is None:
-        _WEAVIATE_CLIENT = init_weaviate()
+        with _INIT_LOCK:
+            if _WEAVIATE_CLIENT is None:
+                client = init_weaviate()
+                ensure_schema(client)
+                _WEAVIATE_CLIENT = client
     return _WEAVIATE_CLIENT
+
+
+def get_collection():
+    """Lazy global handle to the messages collection (avoids rebuilding the wrapper per call)."""
+    global _COLLECTION
+    if _COLLECTION is None:
+        client = get_weaviate_client()
+        with _INIT_LOCK:
+            if _COLLECTION is None:
+                _COLLECTION = client.collections.get(WEAVIATE_CLASS_NAME)
+    return _COLLECTION
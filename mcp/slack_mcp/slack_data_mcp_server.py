@@ -1,12 +1,22 @@
 import os
 import time
+import hashlib
+import asyncio
+import random
 import logging
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from dotenv import load_dotenv
-from typing import Any, Dict, List, Optional
-
-from fastapi import FastAPI, HTTPException, Query
-from pydantic import BaseModel
-from slack_sdk import WebClient
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+import orjson
+from cachetools import LRUCache, TTLCache
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
 
 logging.basicConfig(
@@ -15,81 +25,370 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+load_dotenv() # take environment variables from .env.
+
+# Shared keep-alive pool for every Slack call made by this process
+SLACK_HTTP_MAX_CONNECTIONS = int(os.getenv("SLACK_HTTP_MAX_CONNECTIONS", "100"))
+SLACK_HTTP_MAX_PER_HOST = int(os.getenv("SLACK_HTTP_MAX_PER_HOST", "50"))
+SLACK_HTTP_KEEPALIVE_S = float(os.getenv("SLACK_HTTP_KEEPALIVE_S", "60"))
+
+DEFAULT_CHANNEL_TYPES = "public_channel,private_channel"
+
+# Message projections for the history/thread tools. The default keeps what MCP
+# consumers read; "text_only" is the smallest useful shape, "all" disables it.
+_DEFAULT_MSG_FIELDS: Tuple[str, ...] = ("ts", "user", "text", "thread_ts", "reply_count", "subtype")
+_TEXT_ONLY_MSG_FIELDS: Tuple[str, ...] = ("ts", "user", "text")
+# Top-level keys of Slack message objects that may be requested by name
+_KNOWN_MSG_FIELDS = frozenset((
+    "type", "subtype", "ts", "user", "bot_id", "bot_profile", "app_id", "username",
+    "icons", "team", "text", "blocks", "attachments", "files", "upload",
+    "reactions", "edited", "client_msg_id", "display_as_bot", "pinned_to",
+    "thread_ts", "reply_count", "reply_users", "reply_users_count", "latest_reply",
+    "parent_user_id", "subscribed", "is_locked",
+))
+_FIELDS_DESCRIPTION = (
+    "Comma-separated message keys to return. Defaults to "
+    "ts,user,text,thread_ts,reply_count,subtype (also when empty); 'text_only' keeps "
+    "ts,user,text; 'all' returns Slack's full message objects. Unknown keys are a 400."
+)
+
+# Max Slack calls in flight for one fetch_channel_history_batch request
+HISTORY_BATCH_CONCURRENCY = 10
+HISTORY_BATCH_MAX_QUERIES = 100
+
+# Client-side admission rates per Slack method: (requests per second, burst).
+# Kept just under Slack's published tiers (Tier 2 ~20/min, Tier 3 ~50/min)
+# so calls queue locally instead of bouncing off a 429 + Retry-After.
+SLACK_METHOD_RATES: Dict[str, Tuple[float, int]] = {
+    "conversations_list": (20 / 60, 3),
+    "conversations_history": (50 / 60, 5),
+    "conversations_replies": (50 / 60, 5),
+    "users_list": (20 / 60, 3),
+}
+SLACK_DEFAULT_RATE: Tuple[float, int] = (20 / 60, 3)
+
+# ------------------------------------------------------------
+# Roster caches
+# ------------------------------------------------------------
+
+# Channel/user rosters change on the order of minutes; serve repeat
+# pages from memory instead of spending Slack rate-limit budget on them.
+CHANNELS_CACHE_TTL = int(os.getenv("SLACK_CHANNELS_CACHE_TTL", "60"))
+USERS_CACHE_TTL = int(os.getenv("SLACK_USERS_CACHE_TTL", "600"))
+CACHE_FALLBACK = os.getenv("SLACK_CACHE_FALLBACK", "true").lower() in ("1", "true", "yes")
+# How long past stale_at an entry may still be served while Slack is down
+CACHE_MAX_STALE_S = int(os.getenv("SLACK_CACHE_MAX_STALE_S", "3600"))
+
+# Transport failures that mean "Slack is unavailable" rather than "the request is wrong"
+_SLACK_OUTAGE_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+_channels_cache: TTLCache = TTLCache(maxsize=1024, ttl=CHANNELS_CACHE_TTL)
+_users_cache: TTLCache = TTLCache(maxsize=1024, ttl=USERS_CACHE_TTL)
+# Last good entry per key, kept past its TTL so Slack outages can be bridged
+_stale_entries: LRUCache = LRUCache(maxsize=2048)
+
+
+def _is_slack_outage(e: Exception) -> bool:
+    """
+    True for failures a stale page may paper over: transport errors, timeouts,
+    exhausted rate limits and Slack 5xx. Auth errors, channel_not_found and other
+    API errors are the caller's problem and must surface, not hide behind cache.
+    """
+    if isinstance(e, _SLACK_OUTAGE_ERRORS + (SlackRateLimitedError,)):
+        return True
+    if isinstance(e, SlackApiError) and e.response is not None:
+        status = e.response.status_code
+        return status == 429 or (status is not None and status >= 500)
+    return False
+
+
+async def _cached_page(cache: TTLCache, key: Tuple, fetch) -> Dict[str, Any]:
+    """
+    Return the cached page for 'key', awaiting 'fetch()' on a miss.
+    Entries carry generated_at / stale_at; if Slack is unreachable, rate limited
+    or 5xx after retries, the last good entry is served for up to
+    CACHE_MAX_STALE_S past its stale_at (when CACHE_FALLBACK is enabled).
+    """
+    entry = cache.get(key)
+    if entry is None:
+        try:
+            data = await fetch()
+        except Exception as e:
+            if not _is_slack_outage(e):
+                raise
+            stale = _stale_entries.get(key) if CACHE_FALLBACK else None
+            if stale is None or time.time() - stale["stale_at"] > CACHE_MAX_STALE_S:
+                raise
+            logger.warning(
+                "Slack unavailable for %s; serving entry stale for %.0fs",
+                key[0],
+                time.time() - stale["stale_at"],
+            )
+            return stale["data"]
+        now = time.time()
+        entry = {"data": data, "generated_at": now, "stale_at": now + cache.ttl}
+        cache[key] = entry
+        _stale_entries[key] = entry
+    return entry["data"]
+
+
 # ------------------------------------------------------------
 # Slack Web API wrapper with retry / pagination
 # ------------------------------------------------------------
 
+@lru_cache(maxsize=1024)
+def _fmt_ts(t: float) -> str:
+    """Slack ts string for an epoch float; clients reuse the same windows."""
+    return f"{t:.6f}"
+
+
+class SlackRateLimitedError(Exception):
+    """Raised when a Slack call is still rate limited after all retries."""
+
+    def __init__(self, method_name: str, retry_after: int):
+        super().__init__(f"Slack rate limit on {method_name}; retry after {retry_after}s")
+        self.method_name = method_name
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Asyncio token bucket: refills 'rate' tokens per second up to 'burst'.
+    acquire() waits until a token is available, so outbound traffic is
+    shaped before it reaches Slack.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def saturation(self) -> float:
+        """Fraction of the bucket currently drained (0.0 idle, 1.0 empty)."""
+        self._refill()
+        return 1.0 - self._tokens / self.capacity
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
 class SlackDataClient:
     """
-    A thin wrapper around slack_sdk.WebClient that:
-      - centralizes rate-limit handling (HTTP 429)
+    A thin wrapper around slack_sdk AsyncWebClient that:
+      - shapes outbound calls with per-method token buckets
+      - coalesces identical concurrent roster reads (singleflight)
+      - centralizes rate-limit handling (HTTP 429) and transient 5xx retries
       - provides helpers for pagination
     """
 
+    __slots__ = (
+        "client", "_session", "_methods", "_buckets", "_inflight",
+        "bot_user_id", "team_id", "last_ok_at",
+    )
+
     def __init__(self, bot_token: str):
         if not bot_token:
             raise ValueError("SLACK_BOT_TOKEN is required")
-        self.client = WebClient(token=bot_token)
+        self.client = AsyncWebClient(token=bot_token)
+        # Bound Web API methods resolved once, off the per-attempt hot path
+        self._methods: Dict[str, Any] = {
+            name: getattr(self.client, name) for name in SLACK_METHOD_RATES
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(rate, burst) for name, (rate, burst) in SLACK_METHOD_RATES.items()
+        }
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        self.bot_user_id: Optional[str] = None
+        self.team_id: Optional[str] = None
+        # time.monotonic() of the last successful Slack call (0.0 = never)
+        self.last_ok_at = 0.0
+
+    def _bucket(self, method_name: str) -> TokenBucket:
+        bucket = self._buckets.get(method_name)
+        if bucket is None:
+            bucket = self._buckets[method_name] = TokenBucket(*SLACK_DEFAULT_RATE)
+        return bucket
+
+    async def open_session(self) -> None:
+        """
+        Attach one long-lived pooled aiohttp session to the AsyncWebClient so
+        calls reuse keep-alive connections instead of a session per request.
+        Must be called from the running event loop (app lifespan).
+        """
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=SLACK_HTTP_MAX_CONNECTIONS,
+            limit_per_host=SLACK_HTTP_MAX_PER_HOST,
+            keepalive_timeout=SLACK_HTTP_KEEPALIVE_S,
+        )
+        self._session = aiohttp.ClientSession(connector=connector)
+        self.client.session = self._session
+
+    async def close_session(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self.client.session = None
 
-    def _call_with_retry(self, method_name: str, **kwargs) -> Dict[str, Any]:
+    async def verify_auth(self) -> Dict[str, Any]:
+        """
+        Validate the token once via auth.test and remember the bot identity.
+        Raises RuntimeError so a bad or revoked token stops startup instead of
+        failing every tool call with invalid_auth.
+        """
+        try:
+            resp = await self._call_with_retry("auth_test")
+        except Exception as e:
+            raise RuntimeError(f"Slack auth.test failed: {e}") from e
+        self.bot_user_id = resp.get("user_id")
+        self.team_id = resp.get("team_id")
+        logger.info("Authenticated to Slack as %s (team %s)", self.bot_user_id, self.team_id)
+        return resp
+
+    async def probe(self, timeout: float) -> None:
         """
-        Call a Slack Web API method with basic rate-limit handling.
-        'method_name' is the WebClient method name, e.g. 'conversations_list'.
+        One auth.test attempt bounded by 'timeout', for health probes: no
+        retries or token bucket wait, and the stored bot identity is left as is.
+        Raises whatever the call raises; records last_ok_at on success.
         """
+        await asyncio.wait_for(self.client.auth_test(), timeout=timeout)
+        self.last_ok_at = time.monotonic()
+
+    async def _singleflight(self, key: Tuple, fetch) -> Dict[str, Any]:
+        """
+        Run 'fetch()' once per key at a time: concurrent callers with the same
+        key await one shared task instead of issuing their own Slack call.
+        The fetch runs as its own task and every caller (the first included)
+        awaits it through asyncio.shield, so cancelling any one caller never
+        cancels the call the others are waiting on.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+
+            def _done(t: asyncio.Future) -> None:
+                if self._inflight.get(key) is t:
+                    del self._inflight[key]
+                if not t.cancelled():
+                    t.exception()  # mark retrieved if every caller went away
+
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    async def _call_with_retry(
+        self,
+        method_name: str,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        cap: float = 30.0,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Call a Slack Web API method, retrying 429s and transient 5xx errors.
+        'method_name' is the AsyncWebClient method name, e.g. 'conversations_list'.
+        Every attempt first takes a token from that method's bucket.
+
+        Waits use capped exponential backoff with full jitter,
+        random() * min(cap, base_delay * 2**attempt), but never less than
+        Slack's Retry-After hint. After max_retries a 429 surfaces as
+        SlackRateLimitedError; other errors are re-raised as-is.
+        """
+        method = self._methods.get(method_name)
+        if method is None:
+            method = self._methods[method_name] = getattr(self.client, method_name)
+        bucket = self._bucket(method_name)
+        # saturation refills the bucket to compute; skip it unless DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Bucket %s saturation %.2f", method_name, bucket.saturation)
+        attempt = 0
         while True:
+            await bucket.acquire()
             try:
-                method = getattr(self.client, method_name)
-                resp = method(**kwargs)
+                resp = await method(**kwargs)
+                self.last_ok_at = time.monotonic()
                 return resp.data
             except SlackApiError as e:
-                if e.response is not None and e.response.status_code == 429:
-                    retry_after = int(e.response.headers.get("Retry-After", "1"))
-                    logger.warning(
-                        "Rate limited on %s. Retrying after %s seconds...",
+                status = e.response.status_code if e.response is not None else None
+                retryable = status == 429 or (status is not None and status >= 500)
+                if not retryable:
+                    logger.error(
+                        "Slack API error on %s: %s",
                         method_name,
-                        retry_after,
+                        getattr(e.response, "data", e),
                     )
-                    time.sleep(retry_after)
-                    continue
-
-                logger.error(
-                    "Slack API error on %s: %s",
+                    raise
+
+                retry_after = int(e.response.headers.get("Retry-After", "0")) if status == 429 else 0
+                if attempt >= max_retries:
+                    logger.error("Giving up on %s after %d retries (HTTP %s)", method_name, attempt, status)
+                    if status == 429:
+                        raise SlackRateLimitedError(method_name, max(retry_after, 1)) from e
+                    raise
+
+                backoff = random.random() * min(cap, base_delay * (2 ** attempt))
+                delay = max(retry_after, backoff)
+                logger.warning(
+                    "HTTP %s on %s. Retrying in %.2f seconds (attempt %d/%d)...",
+                    status,
                     method_name,
-                    getattr(e.response, "data", e),
+                    delay,
+                    attempt + 1,
+                    max_retries,
                 )
-                raise
+                await asyncio.sleep(delay)
+                attempt += 1
 
     # ------------- Channels -------------
 
-    def list_channels(
+    async def list_channels(
         self,
-        types: str = "public_channel,private_channel",
+        types: str = DEFAULT_CHANNEL_TYPES,
         limit: int = 200,
         cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Return a single page of channels, plus next_cursor if more pages exist.
-        This mirrors Slack's conversations.list.
+        This mirrors Slack's conversations.list (cached for CHANNELS_CACHE_TTL).
         """
-        resp = self._call_with_retry(
-            "conversations_list",
-            types=types,
-            limit=limit,
-            cursor=cursor,
-        )
-
-        channels = resp.get("channels", [])
-        next_cursor = resp.get("response_metadata", {}).get("next_cursor", "")
-
-        return {"channels": channels, "next_cursor": next_cursor}
-
-    def fetch_channel_history(
+        async def fetch() -> Dict[str, Any]:
+            resp = await self._call_with_retry(
+                "conversations_list",
+                types=types,
+                limit=limit,
+                cursor=cursor,
+            )
+            channels = resp.get("channels", [])
+            next_cursor = resp.get("response_metadata", {}).get("next_cursor", "")
+            return {"channels": channels, "next_cursor": next_cursor}
+
+        key = ("conversations_list", types, limit, cursor)
+        return await _cached_page(_channels_cache, key, lambda: self._singleflight(key, fetch))
+
+    async def fetch_channel_history(
         self,
         channel: str,
         oldest: Optional[float] = None,
         latest: Optional[float] = None,
         limit: int = 200,
         cursor: Optional[str] = None,
+        inclusive: bool = False,
     ) -> Dict[str, Any]:
         """
         Return a single page of messages for a channel, plus next_cursor.
@@ -102,18 +401,79 @@ class SlackDataClient:
         if cursor:
             kwargs["cursor"] = cursor
         if oldest is not None:
-            kwargs["oldest"] = str(oldest)
+            kwargs["oldest"] = _fmt_ts(oldest)
         if latest is not None:
-            kwargs["latest"] = str(latest)
+            kwargs["latest"] = _fmt_ts(latest)
+        if inclusive:
+            kwargs["inclusive"] = True
 
-        resp = self._call_with_retry("conversations_history", **kwargs)
+        resp = await self._call_with_retry("conversations_history", **kwargs)
 
         messages = resp.get("messages", [])
         next_cursor = resp.get("response_metadata", {}).get("next_cursor", "")
 
         return {"messages": messages, "next_cursor": next_cursor}
 
-    def fetch_thread(
+    async def fetch_channel_history_all(
+        self,
+        channel: str,
+        oldest: float,
+        latest: Optional[float] = None,
+        concurrency: int = 8,
+        partitions: int = 16,
+        limit: int = 200,
+    ) -> Dict[str, Any]:
+        """
+        Return every message in [oldest, latest] for a channel.
+
+        The window is split into 'partitions' equal sub-ranges, of which at
+        most 'concurrency' have a Slack call in flight at once; each sub-range
+        walks its own next_cursor sequentially. Using more partitions than
+        slots keeps slots busy when activity is skewed toward part of the
+        window. Sub-ranges are inclusive at both ends, so boundary messages
+        are de-duplicated by ts. Newest first, like Slack.
+        """
+        if latest is None:
+            latest = time.time()
+        if latest <= oldest:
+            raise ValueError("latest must be greater than oldest")
+        partitions = max(1, partitions)
+        step = (latest - oldest) / partitions
+        chunks = [
+            (oldest + i * step, latest if i == partitions - 1 else oldest + (i + 1) * step)
+            for i in range(partitions)
+        ]
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def walk(chunk_oldest: float, chunk_latest: float) -> List[Dict[str, Any]]:
+            messages: List[Dict[str, Any]] = []
+            cursor: Optional[str] = None
+            while True:
+                async with sem:
+                    page = await self.fetch_channel_history(
+                        channel,
+                        oldest=chunk_oldest,
+                        latest=chunk_latest,
+                        limit=limit,
+                        cursor=cursor,
+                        inclusive=True,
+                    )
+                messages.extend(page["messages"])
+                cursor = page["next_cursor"]
+                if not cursor:
+                    return messages
+
+        pages = await asyncio.gather(*(walk(o, l) for o, l in chunks))
+
+        by_ts: Dict[str, Dict[str, Any]] = {}
+        for chunk_messages in pages:
+            for m in chunk_messages:
+                by_ts.setdefault(m.get("ts", ""), m)
+        messages = sorted(by_ts.values(), key=lambda m: float(m.get("ts") or 0), reverse=True)
+
+        return {"messages": messages, "next_cursor": ""}
+
+    async def fetch_thread(
         self,
         channel: str,
         thread_ts: str,
@@ -132,7 +492,7 @@ class SlackDataClient:
         if cursor:
             kwargs["cursor"] = cursor
 
-        resp = self._call_with_retry("conversations_replies", **kwargs)
+        resp = await self._call_with_retry("conversations_replies", **kwargs)
 
         messages = resp.get("messages", [])
         next_cursor = resp.get("response_metadata", {}).get("next_cursor", "")
@@ -141,14 +501,14 @@ class SlackDataClient:
 
     # ------------- Users -------------
 
-    def list_users(
+    async def list_users(
         self,
         limit: int = 200,
         cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Return a single page of users, plus next_cursor.
-        This mirrors users.list.
+        This mirrors users.list (cached for USERS_CACHE_TTL).
         """
         kwargs: Dict[str, Any] = {
             "limit": limit,
@@ -156,16 +516,16 @@ class SlackDataClient:
         if cursor:
             kwargs["cursor"] = cursor
 
-        resp = self._call_with_retry("users_list", **kwargs)
-
-        members = resp.get("members", [])
-        next_cursor = resp.get("response_metadata", {}).get("next_cursor", "")
+        async def fetch() -> Dict[str, Any]:
+            resp = await self._call_with_retry("users_list", **kwargs)
+            members = resp.get("members", [])
+            next_cursor = resp.get("response_metadata", {}).get("next_cursor", "")
+            return {"users": members, "next_cursor": next_cursor}
 
-        return {"users": members, "next_cursor": next_cursor}
+        key = ("users_list", None, limit, cursor)
+        return await _cached_page(_users_cache, key, lambda: self._singleflight(key, fetch))
 
 
-load_dotenv() # take environment variables from .env.
-
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 slack_client = SlackDataClient(bot_token=SLACK_BOT_TOKEN)
 
@@ -190,12 +550,45 @@ class UserListResponse(BaseModel):
     next_cursor: str
 
 
+class HistoryQuery(BaseModel):
+    channel: str
+    oldest: Optional[float] = None
+    latest: Optional[float] = None
+    limit: int = Field(200, ge=1, le=1000)
+    cursor: Optional[str] = None
+
+
+class HistoryBatchItem(BaseModel):
+    channel: str
+    ok: bool
+    messages: List[Dict[str, Any]] = []
+    next_cursor: str = ""
+    error: Optional[str] = None
+
+
+class HistoryBatchResponse(BaseModel):
+    results: List[HistoryBatchItem]
+
+
 # ------------------------------------------------------------
 # FastAPI app exposing Slack data as MCP tools
 # ------------------------------------------------------------
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await slack_client.open_session()
+    try:
+        await slack_client.verify_auth()
+        app.state.bot_id = slack_client.bot_user_id
+        app.state.team_id = slack_client.team_id
+        yield
+    finally:
+        await slack_client.close_session()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Slack Data MCP Server",
     description=(
         "MCP-style server that wraps Slack Web API for conversations & users. "
@@ -203,21 +596,111 @@ app = FastAPI(
         "Use this as a standalone microservice or as a tool provider for an MCP client."
     ),
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+def _slack_http_error(e: Exception, tool: str) -> HTTPException:
+    """
+    Map a Slack failure to an HTTPException. Rate limits surface as 429 with
+    Retry-After and a stable error envelope so MCP clients can back off;
+    everything else is a 500.
+    """
+    retry_after: Optional[str] = None
+    if isinstance(e, SlackRateLimitedError):
+        retry_after = str(e.retry_after)
+    elif isinstance(e, SlackApiError) and e.response is not None and e.response.status_code == 429:
+        retry_after = e.response.headers.get("Retry-After", "1")
+
+    if retry_after is not None:
+        logger.warning("Rate limited in %s; telling client to retry after %ss", tool, retry_after)
+        return HTTPException(
+            status_code=429,
+            headers={"Retry-After": retry_after},
+            detail={
+                "ok": False,
+                "code": "agent.rate_limited",
+                "message": f"Slack rate limit reached in {tool}. Retry after {retry_after} seconds.",
+            },
+        )
+
+    logger.exception("Error in %s", tool)
+    return HTTPException(status_code=500, detail=str(e))
+
+@lru_cache(maxsize=256)
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Resolve the 'fields' query param to a key whitelist (None = keep everything).
+    Empty input means the default set; unknown keys are rejected with a 400.
+    Called before any Slack request so a bad param costs no API quota.
+    """
+    fields = (fields or "").strip()
+    if not fields:
+        return _DEFAULT_MSG_FIELDS
+    if fields == "all":
+        return None
+    if fields == "text_only":
+        return _TEXT_ONLY_MSG_FIELDS
+    keep = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in keep if f not in _KNOWN_MSG_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown message field(s): {', '.join(unknown)}",
+        )
+    return keep or _DEFAULT_MSG_FIELDS
+
+
+def _project_messages(result: Dict[str, Any], keep: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+    if keep is None:
+        return result
+    messages = [{k: m[k] for k in keep if k in m} for m in result["messages"]]
+    return {"messages": messages, "next_cursor": result["next_cursor"]}
+
+
+def cached_json(request: Request, payload: Dict[str, Any], ttl: int) -> Response:
+    """Serialize payload with a weak ETag + Cache-Control; 304 if the client already has it."""
+    # Duplicated in app/main.py: the two services are built from separate Docker
+    # contexts and can't import each other. Keep the copies identical.
+    body = orjson.dumps(payload)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={ttl}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+# Orchestrator probes: healthy iff Slack answered recently. Only when the
+# last success is older than the window does a probe spend one auth.test.
+HEALTHZ_WINDOW_S = 60.0
+HEALTHZ_PROBE_TIMEOUT_S = 2.0
+
+
+@app.get("/healthz")
+async def healthz():
+    if time.monotonic() - slack_client.last_ok_at >= HEALTHZ_WINDOW_S:
+        try:
+            await slack_client.probe(timeout=HEALTHZ_PROBE_TIMEOUT_S)
+        except Exception as e:
+            logger.warning("healthz: Slack auth.test probe failed: %r", e)
+            return ORJSONResponse(status_code=503, content={"status": "unhealthy", "slack": "unreachable"})
+    return {"status": "healthy", "bot_id": slack_client.bot_user_id, "team_id": slack_client.team_id}
 
 # ------------- MCP Tools Endpoints -------------
 
 # - GET /tools/list_channels
 # - GET /tools/fetch_channel_history
+# - GET /tools/fetch_channel_history_all
+# - POST /tools/fetch_channel_history_batch
 # - GET /tools/fetch_thread
 # - GET /tools/list_users
 
 # ------------------------------------------------------------
 
-@app.get("/tools/list_channels", response_model=ChannelListResponse)
-def tool_list_channels(
+@app.get("/tools/list_channels", response_model=None, responses={200: {"model": ChannelListResponse}})
+async def tool_list_channels(
+    request: Request,
     types: str = Query(
-        "public_channel,private_channel",
+        DEFAULT_CHANNEL_TYPES,
         description="Comma-separated channel types: public_channel,private_channel,im,mpim",
     ),
     limit: int = Query(200, ge=1, le=1000),
@@ -233,15 +716,17 @@ def tool_list_channels(
     next_cursor if more pages are available.
     """
     try:
-        result = slack_client.list_channels(types=types, limit=limit, cursor=cursor)
-        return ChannelListResponse(**result)
+        result = await slack_client.list_channels(types=types, limit=limit, cursor=cursor)
+        return cached_json(request, result, CHANNELS_CACHE_TTL)
+    except (SlackRateLimitedError, SlackApiError) as e:
+        raise _slack_http_error(e, "list_channels")
     except Exception as e:
         logger.exception("Error in list_channels")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/tools/fetch_channel_history", response_model=MessagePageResponse)
-def tool_fetch_channel_history(
+@app.get("/tools/fetch_channel_history", response_model=None, responses={200: {"model": MessagePageResponse}})
+async def tool_fetch_channel_history(
     channel: str = Query(..., description="Slack channel ID (e.g. C0123456789)"),
     oldest: Optional[float] = Query(
         None,
@@ -255,55 +740,162 @@ def tool_fetch_channel_history(
     cursor: Optional[str] = Query(
         None, description="Slack cursor for pagination. If omitted, starts at first page."
     ),
+    fields: Optional[str] = Query(
+        None,
+        description=_FIELDS_DESCRIPTION,
+    ),
 ):
     """
     MCP Tool: fetch_channel_history
 
     Returns a single page of channel messages from Slack's conversations.history.
     """
+    keep = _parse_fields(fields)
     try:
-        result = slack_client.fetch_channel_history(
+        result = await slack_client.fetch_channel_history(
             channel=channel,
             oldest=oldest,
             latest=latest,
             limit=limit,
             cursor=cursor,
         )
-        return MessagePageResponse(**result)
+        return _project_messages(result, keep)
+    except (SlackRateLimitedError, SlackApiError) as e:
+        raise _slack_http_error(e, "fetch_channel_history")
     except Exception as e:
         logger.exception("Error in fetch_channel_history")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/tools/fetch_thread", response_model=MessagePageResponse)
-def tool_fetch_thread(
+@app.get("/tools/fetch_channel_history_all", response_model=None, responses={200: {"model": MessagePageResponse}})
+async def tool_fetch_channel_history_all(
+    channel: str = Query(..., description="Slack channel ID (e.g. C0123456789)"),
+    oldest: float = Query(..., description="Oldest timestamp to include (as Unix epoch float)."),
+    latest: Optional[float] = Query(
+        None,
+        description="Latest timestamp to include (as Unix epoch float). Defaults to now.",
+    ),
+    concurrency: int = Query(8, ge=1, le=32, description="Max Slack calls in flight at once."),
+    partitions: int = Query(16, ge=1, le=128, description="Number of time sub-ranges the window is split into."),
+    limit: int = Query(200, ge=1, le=1000, description="Page size for each underlying Slack call."),
+    fields: Optional[str] = Query(
+        None,
+        description=_FIELDS_DESCRIPTION,
+    ),
+):
+    """
+    MCP Tool: fetch_channel_history_all
+
+    Returns the complete channel history between oldest and latest, fetching
+    time sub-ranges concurrently instead of one cursor page per round trip.
+    next_cursor is always empty.
+    """
+    keep = _parse_fields(fields)
+    if (latest if latest is not None else time.time()) <= oldest:
+        raise HTTPException(status_code=400, detail="latest (default: now) must be greater than oldest")
+    try:
+        result = await slack_client.fetch_channel_history_all(
+            channel=channel,
+            oldest=oldest,
+            latest=latest,
+            concurrency=concurrency,
+            partitions=partitions,
+            limit=limit,
+        )
+        return _project_messages(result, keep)
+    except (SlackRateLimitedError, SlackApiError) as e:
+        raise _slack_http_error(e, "fetch_channel_history_all")
+    except Exception as e:
+        logger.exception("Error in fetch_channel_history_all")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post(
+    "/tools/fetch_channel_history_batch",
+    response_model=None,
+    responses={200: {"model": HistoryBatchResponse}},
+)
+async def tool_fetch_channel_history_batch(
+    queries: List[HistoryQuery],
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
+):
+    """
+    MCP Tool: fetch_channel_history_batch
+
+    Fetches one history page per query concurrently (bounded by
+    HISTORY_BATCH_CONCURRENCY). Results come back in query order, each with
+    ok/error, so one failing channel doesn't fail the whole batch.
+    """
+    keep = _parse_fields(fields)
+    if len(queries) > HISTORY_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {HISTORY_BATCH_MAX_QUERIES} queries per batch",
+        )
+
+    sem = asyncio.Semaphore(HISTORY_BATCH_CONCURRENCY)
+
+    async def _one(q: HistoryQuery) -> Dict[str, Any]:
+        async with sem:
+            return await slack_client.fetch_channel_history(**q.model_dump())
+
+    pages = await asyncio.gather(*(_one(q) for q in queries), return_exceptions=True)
+
+    results: List[Dict[str, Any]] = []
+    for q, page in zip(queries, pages):
+        if isinstance(page, BaseException):
+            if isinstance(page, SlackRateLimitedError):
+                error = "agent.rate_limited"
+            elif isinstance(page, SlackApiError):
+                error = page.response.get("error", str(page)) if page.response is not None else str(page)
+            else:
+                error = str(page)
+            logger.warning("fetch_channel_history_batch: %s failed: %s", q.channel, error)
+            results.append({"channel": q.channel, "ok": False, "messages": [], "next_cursor": "", "error": error})
+        else:
+            page = _project_messages(page, keep)
+            results.append({"channel": q.channel, "ok": True, **page, "error": None})
+
+    return {"results": results}
+
+
+@app.get("/tools/fetch_thread", response_model=None, responses={200: {"model": MessagePageResponse}})
+async def tool_fetch_thread(
     channel: str = Query(..., description="Slack channel ID containing the thread."),
     thread_ts: str = Query(..., description="Parent message ts of the thread."),
     limit: int = Query(200, ge=1, le=1000),
     cursor: Optional[str] = Query(
         None, description="Slack cursor for pagination. If omitted, starts at first page."
     ),
+    fields: Optional[str] = Query(
+        None,
+        description=_FIELDS_DESCRIPTION,
+    ),
 ):
     """
     MCP Tool: fetch_thread
 
     Returns a single page of messages for a thread using conversations.replies.
     """
+    keep = _parse_fields(fields)
     try:
-        result = slack_client.fetch_thread(
+        result = await slack_client.fetch_thread(
             channel=channel,
             thread_ts=thread_ts,
             limit=limit,
             cursor=cursor,
         )
-        return MessagePageResponse(**result)
+        return _project_messages(result, keep)
+    except (SlackRateLimitedError, SlackApiError) as e:
+        raise _slack_http_error(e, "fetch_thread")
     except Exception as e:
         logger.exception("Error in fetch_thread")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/tools/list_users", response_model=UserListResponse)
-def tool_list_users(
+@app.get("/tools/list_users", response_model=None, responses={200: {"model": UserListResponse}})
+async def tool_list_users(
+    request: Request,
     limit: int = Query(200, ge=1, le=1000),
     cursor: Optional[str] = Query(
         None, description="Slack cursor for pagination. If omitted, starts at first page."
@@ -315,8 +907,10 @@ def tool_list_users(
     Returns a single page of users from Slack's users.list.
     """
     try:
-        result = slack_client.list_users(limit=limit, cursor=cursor)
-        return UserListResponse(**result)
+        result = await slack_client.list_users(limit=limit, cursor=cursor)
+        return cached_json(request, result, USERS_CACHE_TTL)
+    except (SlackRateLimitedError, SlackApiError) as e:
+        raise _slack_http_error(e, "list_users")
     except Exception as e:
         logger.exception("Error in list_users")
         raise HTTPException(status_code=500, detail=str(e))
@@ -329,9 +923,15 @@ def tool_list_users(
 if __name__ == "__main__":
     import uvicorn
 
+    # DEV=1 enables the reloader; otherwise serve on uvloop + httptools.
+    # Roster caches, token buckets and singleflight state are per process,
+    # so each of WORKERS keeps its own copy.
     uvicorn.run(
         "slack_data_mcp_server:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", "3030")),
-        reload=True,
+        reload=os.getenv("DEV") == "1",
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", "1")),
     )
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+# The module builds its Slack client at import time and needs a token to do so
+os.environ.setdefault("SLACK_BOT_TOKEN", "xoxb-test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import slack_data_mcp_server as server  # noqa: E402
+
+MESSAGE = {
+    "type": "message",
+    "ts": "1712000000.000100",
+    "user": "U12345",
+    "text": "board rev B bring-up notes",
+    "thread_ts": "1712000000.000100",
+    "reply_count": 2,
+    "blocks": [{"type": "rich_text"}],
+}
+
+
+class FakeSlackClient:
+    """Stands in for SlackDataClient; records calls and returns one canned page."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_channel_history(self, **kwargs):
+        self.calls.append(("fetch_channel_history", kwargs))
+        return {"messages": [dict(MESSAGE)], "next_cursor": None}
+
+    async def fetch_thread(self, **kwargs):
+        self.calls.append(("fetch_thread", kwargs))
+        return {"messages": [dict(MESSAGE)], "next_cursor": None}
+
+
+@pytest.fixture
+def fake_slack(monkeypatch):
+    fake = FakeSlackClient()
+    monkeypatch.setattr(server, "slack_client", fake)
+    return fake
@@ -0,0 +1,55 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from cachetools import TTLCache
+from slack_sdk.errors import SlackApiError
+
+import slack_data_mcp_server as server
+
+KEY = ("list_channels", "public_channel", 200, None)
+STALE_PAGE = {"channels": [{"id": "C67890"}], "next_cursor": None}
+
+
+def _api_error(status_code, error):
+    response = SimpleNamespace(status_code=status_code, headers={}, data={"ok": False, "error": error})
+    return SlackApiError(error, response)
+
+
+def _fetch_raising(exc):
+    async def fetch():
+        raise exc
+    return fetch
+
+
+@pytest.fixture
+def stale_entry(monkeypatch):
+    monkeypatch.setattr(server, "CACHE_FALLBACK", True)
+    monkeypatch.setattr(server, "_stale_entries", {})
+    now = time.time()
+    server._stale_entries[KEY] = {"data": STALE_PAGE, "generated_at": now - 120, "stale_at": now - 60}
+    return TTLCache(maxsize=8, ttl=60)
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        _api_error(503, "service_unavailable"),
+        _api_error(429, "ratelimited"),
+        server.SlackRateLimitedError("conversations.list", 30),
+        asyncio.TimeoutError(),
+    ],
+)
+def test_outages_serve_stale_page(stale_entry, exc):
+    page = asyncio.run(server._cached_page(stale_entry, KEY, _fetch_raising(exc)))
+
+    assert page is STALE_PAGE
+
+
+@pytest.mark.parametrize("status_code, error", [(200, "invalid_auth"), (200, "channel_not_found")])
+def test_request_errors_are_not_hidden_by_stale_page(stale_entry, status_code, error):
+    with pytest.raises(SlackApiError) as excinfo:
+        asyncio.run(server._cached_page(stale_entry, KEY, _fetch_raising(_api_error(status_code, error))))
+
+    assert excinfo.value.response.data["error"] == error
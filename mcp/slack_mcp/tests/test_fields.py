@@ -0,0 +1,45 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import slack_data_mcp_server as server
+
+
+@pytest.mark.parametrize("fields", ["", "   ", " , "])
+def test_empty_fields_use_default_projection(fake_slack, fields):
+    client = TestClient(server.app)
+
+    resp = client.get(
+        "/tools/fetch_channel_history",
+        params={"channel": "C67890", "fields": fields},
+    )
+
+    assert resp.status_code == 200
+    (msg,) = resp.json()["messages"]
+    assert set(msg) == {"ts", "user", "text", "thread_ts", "reply_count"}
+
+
+def test_explicit_fields_are_projected(fake_slack):
+    client = TestClient(server.app)
+
+    resp = client.get(
+        "/tools/fetch_thread",
+        params={"channel": "C67890", "thread_ts": "1712000000.000100", "fields": "ts, blocks"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["messages"] == [
+        {"ts": "1712000000.000100", "blocks": [{"type": "rich_text"}]}
+    ]
+
+
+def test_unknown_field_is_rejected_before_calling_slack(fake_slack):
+    client = TestClient(server.app)
+
+    resp = client.get(
+        "/tools/fetch_channel_history",
+        params={"channel": "C67890", "fields": "ts,txt"},
+    )
+
+    assert resp.status_code == 400
+    assert "txt" in resp.json()["detail"]
+    assert fake_slack.calls == []